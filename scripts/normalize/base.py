@@ -4,11 +4,30 @@ Base class for data normalization.
 """
 
 import json
+import mmap
+import os
 from abc import ABC, abstractmethod
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson.backends.yajl2_c as ijson  # type: ignore[import-untyped]
+except ImportError:
+    try:
+        import ijson  # type: ignore[import-untyped]
+    except ImportError:
+        ijson = None
+
+
+# Buffer size for raw/normalized file I/O (default is 8 KB)
+IO_BUFFER_SIZE = 1 << 16
 
 # Common normalized schema
 NORMALIZED_SCHEMA = {
@@ -17,6 +36,170 @@ NORMALIZED_SCHEMA = {
 }
 
 
+def load_json(path: Path) -> Any:
+    """
+    Load a JSON/GeoJSON file.
+
+    Uses orjson when installed (several times faster on large raw dumps),
+    parsing straight from a read-only memory map so the file is not first
+    copied into a bytes object. Falls back to the stdlib json module.
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(f.read())  # mmap cannot map empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+    with open(path, buffering=IO_BUFFER_SIZE) as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: Any, indent: bool = False) -> None:
+    """
+    Write a JSON/GeoJSON file.
+
+    Uses orjson when installed, falling back to the stdlib json module.
+
+    Args:
+        path: Output file
+        data: JSON-serializable object
+        indent: Pretty-print with a two-space indent
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+        return
+    with open(path, 'w', buffering=IO_BUFFER_SIZE) as f:
+        json.dump(data, f, indent=2 if indent else None)
+
+
+def write_ndjson(path: Path, features: Iterable[Dict]) -> int:
+    """
+    Write features as newline-delimited GeoJSON (one Feature per line).
+
+    Line-delimited output can be consumed incrementally downstream
+    (e.g. tippecanoe -P, ijson, line-by-line orjson) without loading a
+    whole FeatureCollection.
+
+    Returns:
+        Number of features written
+    """
+    count = 0
+    with open(path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        for feature in features:
+            if orjson is not None:
+                f.write(orjson.dumps(feature))
+            else:
+                f.write(json.dumps(feature).encode('utf-8'))
+            f.write(b'\n')
+            count += 1
+    return count
+
+
+def write_feature_collection(path: Path, features: Iterable[Dict],
+                             name: Optional[str] = None) -> int:
+    """
+    Stream features into a GeoJSON FeatureCollection file.
+
+    Features are serialized one at a time (one per line) as they are
+    produced, so a generator of features never has to be held in memory
+    alongside its serialized form. The file is written to a temporary
+    name and moved into place once complete.
+
+    Args:
+        path: Output file
+        features: Features to write
+        name: Optional collection "name" member
+
+    Returns:
+        Number of features written
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    count = 0
+    try:
+        with open(tmp_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            f.write(b'{"type":"FeatureCollection",')
+            if name is not None:
+                f.write(b'"name":' + json.dumps(name).encode('utf-8') + b',')
+            f.write(b'"features":[\n')
+            for feature in features:
+                if count:
+                    f.write(b',\n')
+                if orjson is not None:
+                    f.write(orjson.dumps(feature))
+                else:
+                    f.write(json.dumps(feature).encode('utf-8'))
+                count += 1
+            f.write(b'\n]}\n')
+    except BaseException:
+        # Leave neither a truncated output nor the temporary file behind
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+    return count
+
+
+# GeoJSON files larger than this are streamed with ijson (when installed)
+STREAM_THRESHOLD_BYTES = 10 * 1024 * 1024
+
+
+def should_stream(path: Path) -> bool:
+    """Whether a raw file is large enough to be streamed with ijson."""
+    return ijson is not None and path.stat().st_size > STREAM_THRESHOLD_BYTES
+
+
+def stream_json_items(path: Path, prefix: str) -> Iterator[Any]:
+    """
+    Yield the items under an ijson prefix one at a time.
+
+    The file is only opened once iteration starts, so several passes over
+    the same file can be set up up front. Requires ijson.
+
+    Args:
+        path: JSON file to read
+        prefix: ijson prefix, e.g. 'features.item' or 'elements.item'
+    """
+    with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        yield from ijson.items(f, prefix, buf_size=IO_BUFFER_SIZE, use_float=True)
+
+
+def iter_geojson_features(path: Path) -> Optional[Iterator[Dict]]:
+    """
+    Iterate over the features of a GeoJSON file.
+
+    Large FeatureCollections are streamed with ijson so peak memory does not
+    grow with file size. Small files, single Features, and installs without
+    ijson are parsed in one go with load_json().
+
+    Returns:
+        Iterator over features, or None if the file is neither a
+        FeatureCollection nor a Feature
+    """
+    if should_stream(path):
+        with open(path, 'rb') as f:
+            geojson_type = next(ijson.items(f, 'type'), None)
+        if geojson_type == 'FeatureCollection':
+            return stream_json_items(path, 'features.item')
+
+    data = load_json(path)
+    if data.get('type') == 'FeatureCollection':
+        return iter(data.get('features', []))
+    elif data.get('type') == 'Feature':
+        return iter([data])
+    return None
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 class BaseNormalizer(ABC):
     """Base class for source-specific data normalizers."""
 
@@ -28,6 +211,10 @@ class BaseNormalizer(ABC):
         self.normalized_dir = self.source_dir / 'normalized'
         self.manifest_path = self.source_dir / 'manifest.json'
 
+        # Ingest date stamped on every feature; formatting it per feature
+        # costs more than building the rest of the properties dict
+        self.ingested = datetime.utcnow().strftime('%Y-%m-%d')
+
         # Ensure directories exist
         self.normalized_dir.mkdir(parents=True, exist_ok=True)
 
@@ -70,10 +257,10 @@ class BaseNormalizer(ABC):
         Returns:
             Normalized GeoJSON feature
         """
-        props = {
+        props: Dict[str, Any] = {
             '_src': self.source_id,
             '_src_id': src_id,
-            '_ingested': datetime.utcnow().strftime('%Y-%m-%d'),
+            '_ingested': self.ingested,
         }
 
         if sd is not None:
@@ -126,8 +313,14 @@ class BaseNormalizer(ABC):
         """
         pass
 
-    def run(self) -> bool:
-        """Run normalization and save output."""
+    def run(self, ndjson: bool = False) -> bool:
+        """
+        Run normalization and save output.
+
+        Args:
+            ndjson: Write newline-delimited GeoJSON (buildings.ndjson)
+                instead of a FeatureCollection (buildings.geojson)
+        """
         print(f"Normalizing {self.source_id}...")
 
         try:
@@ -149,18 +342,23 @@ class BaseNormalizer(ABC):
                 return False
 
             # Save output
-            output_path = self.normalized_dir / 'buildings.geojson'
-            output = {
-                'type': 'FeatureCollection',
-                'features': features
-            }
-            with open(output_path, 'w') as f:
-                json.dump(output, f)
+            if ndjson:
+                output_name = 'buildings.ndjson'
+                output_path = self.normalized_dir / output_name
+                write_ndjson(output_path, features)
+            else:
+                output_name = 'buildings.geojson'
+                output_path = self.normalized_dir / output_name
+                output = {
+                    'type': 'FeatureCollection',
+                    'features': features
+                }
+                write_json(output_path, output)
 
             # Update manifest
             manifest = self.load_manifest()
             manifest['normalized_at'] = datetime.utcnow().isoformat() + 'Z'
-            manifest['normalized_file'] = 'buildings.geojson'
+            manifest['normalized_file'] = output_name
             manifest['normalized_count'] = len(features)
             self.save_manifest(manifest)
 
@@ -9,13 +9,18 @@ Extends BaseNormalizer with road-specific features:
 - NVDB reference (nvdb_id)
 """
 
-import json
 from abc import abstractmethod
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .base import BaseNormalizer
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .base import BaseNormalizer, write_json, write_ndjson
 
 
 # Road-specific normalized schema
@@ -80,7 +85,7 @@ class BaseRoadNormalizer(BaseNormalizer):
         props = {
             '_src': self.source_id,
             '_src_id': src_id,
-            '_ingested': datetime.utcnow().strftime('%Y-%m-%d'),
+            '_ingested': self.ingested,
         }
 
         if sd is not None:
@@ -182,6 +187,95 @@ class BaseRoadNormalizer(BaseNormalizer):
 
         return None
 
+    def calculate_lengths(self, geometries: List[Dict]) -> List[Optional[float]]:
+        """
+        Calculate lengths in meters for many geometries at once.
+
+        With numpy available, all line vertices are concatenated into one
+        array and every segment's haversine distance is computed in a single
+        vectorized pass, then summed per line. Otherwise (or for ragged
+        2D/3D coordinate mixes) falls back to calculate_length() per geometry.
+
+        Returns:
+            One length per geometry (None for non-line geometries)
+        """
+        if np is None:
+            return [self.calculate_length(g) for g in geometries]
+
+        lengths: List[Optional[float]] = [None] * len(geometries)
+        lines = []    # coordinate lists of every (part of every) line
+        owners = []   # index into geometries for each entry in lines
+
+        for i, geometry in enumerate(geometries):
+            geom_type = geometry.get('type')
+            coords = geometry.get('coordinates', [])
+            if geom_type == 'LineString':
+                parts = (coords,)
+            elif geom_type == 'MultiLineString':
+                parts = coords
+            else:
+                continue
+            lengths[i] = 0.0
+            for line in parts:
+                if len(line) >= 2:
+                    lines.append(line)
+                    owners.append(i)
+
+        if not lines:
+            return lengths
+
+        try:
+            points = np.array(list(chain.from_iterable(lines)), dtype=np.float64)[:, :2]
+        except (ValueError, IndexError):
+            return [self.calculate_length(g) for g in geometries]
+
+        R = 6371000  # Earth radius in meters
+        lon = np.radians(points[:, 0])
+        lat = np.radians(points[:, 1])
+        dphi = lat[1:] - lat[:-1]
+        dlambda = lon[1:] - lon[:-1]
+        a = np.sin(dphi / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlambda / 2) ** 2
+        segment = 2 * R * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+        # Sum segments within each line; pairs spanning two lines are excluded
+        # by differencing the running sum at each line's first and last vertex
+        counts = np.fromiter((len(line) for line in lines), dtype=np.int64, count=len(lines))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        ends = starts + counts - 1
+        running = np.concatenate(([0.0], np.cumsum(segment)))
+        line_lengths = running[ends] - running[starts]
+
+        totals = np.zeros(len(geometries))
+        np.add.at(totals, np.asarray(owners), line_lengths)
+        for i in set(owners):
+            lengths[i] = float(totals[i])
+
+        return lengths
+
+    def assign_lengths(self, features: List[Dict]) -> None:
+        """
+        Fill in 'len' for normalized road features that do not have one yet.
+
+        Lengths are computed in one batch with calculate_lengths().
+        """
+        missing = [f for f in features if 'len' not in f['properties']]
+        if not missing:
+            return
+
+        lengths = self.calculate_lengths([f['geometry'] for f in missing])
+        for feature, length in zip(missing, lengths):
+            if length is not None:
+                feature['properties']['len'] = round(length, 1)
+
+    def write_extra_outputs(self, features: List[Dict]) -> None:
+        """
+        Write additional output formats for the validated features.
+
+        Called by run() after the main output is saved. Does nothing by
+        default; subclasses override it (e.g. NVDB's GeoParquet).
+        """
+        pass
+
     @abstractmethod
     def normalize(self) -> List[Dict]:
         """
@@ -192,8 +286,14 @@ class BaseRoadNormalizer(BaseNormalizer):
         """
         pass
 
-    def run(self) -> bool:
-        """Run normalization and save output."""
+    def run(self, ndjson: bool = False) -> bool:
+        """
+        Run normalization and save output.
+
+        Args:
+            ndjson: Write newline-delimited GeoJSON (roads.ndjson)
+                instead of a FeatureCollection (roads.geojson)
+        """
         print(f"Normalizing roads from {self.source_id}...")
 
         try:
@@ -217,18 +317,25 @@ class BaseRoadNormalizer(BaseNormalizer):
                     print(f"    ... and {len(errors) - 10} more")
 
             # Save output (even if some features had errors, save the valid ones)
-            output_path = self.normalized_dir / 'roads.geojson'
-            output = {
-                'type': 'FeatureCollection',
-                'features': valid_features
-            }
-            with open(output_path, 'w') as f:
-                json.dump(output, f)
+            if ndjson:
+                output_name = 'roads.ndjson'
+                output_path = self.normalized_dir / output_name
+                write_ndjson(output_path, valid_features)
+            else:
+                output_name = 'roads.geojson'
+                output_path = self.normalized_dir / output_name
+                output = {
+                    'type': 'FeatureCollection',
+                    'features': valid_features
+                }
+                write_json(output_path, output)
+
+            self.write_extra_outputs(valid_features)
 
             # Update manifest
             manifest = self.load_manifest()
             manifest['normalized_at'] = datetime.utcnow().isoformat() + 'Z'
-            manifest['normalized_file'] = 'roads.geojson'
+            manifest['normalized_file'] = output_name
             manifest['normalized_count'] = len(valid_features)
             manifest['validation_errors'] = len(errors)
             self.save_manifest(manifest)
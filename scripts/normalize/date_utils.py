@@ -16,7 +16,42 @@ Handles various formats:
 """
 
 import re
-from typing import Optional, Union, Tuple
+import string
+from functools import lru_cache
+from typing import Any, Optional, Union, Tuple
+
+
+# ASCII-only lowercasing table; most heritage date strings are plain ASCII
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def clean_date_string(value: str) -> str:
+    """
+    Strip whitespace and lowercase a date string.
+
+    ASCII strings that are already lowercase are returned as-is; other
+    ASCII strings are folded with a single translate() pass.
+
+    Args:
+        value: Raw date string
+
+    Returns:
+        Stripped, lowercased string
+
+    Examples:
+        >>> clean_date_string("  Ca 1950 ")
+        'ca 1950'
+        >>> clean_date_string("1800-TALLET")
+        '1800-tallet'
+        >>> clean_date_string("19. Århundre")
+        '19. århundre'
+    """
+    value = value.strip()
+    if not value.isascii():
+        return value.lower()
+    if value.islower():
+        return value
+    return value.translate(_ASCII_LOWER)
 
 
 def parse_year(value: Union[str, int, float, None]) -> Optional[int]:
@@ -71,7 +106,7 @@ def parse_year(value: Union[str, int, float, None]) -> Optional[int]:
         return None
 
     # Clean and normalize string
-    value = value.strip().lower()
+    value = clean_date_string(value)
 
     if not value:
         return None
@@ -181,7 +216,7 @@ def parse_date_range(value: str) -> Tuple[Optional[int], Optional[int]]:
     if not value or not isinstance(value, str):
         return (None, None)
 
-    value = value.strip().lower()
+    value = clean_date_string(value)
 
     # Explicit range "1950-1960"
     match = re.match(r'^(\d{4})\s*[-–]\s*(\d{4})$', value)
@@ -316,6 +351,81 @@ def is_valid_year(year: int, min_year: int = 1700, max_year: int = 2030) -> bool
     return min_year <= year <= max_year
 
 
+# Explicit year range: "1880-1890", "1880 – 1890"
+_YEAR_RANGE_RE = re.compile(r'^(\d{4})\s*[-–]\s*(\d{4})$')
+
+
+def parse_year_range(value: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an explicit year range like "1830-1840" to (start, end).
+
+    Unlike parse_date_range(), only the plain "YYYY-YYYY" form is accepted
+    and the years are not range-checked.
+
+    Examples:
+        >>> parse_year_range("1830-1840")
+        (1830, 1840)
+        >>> parse_year_range("1830s") is None
+        True
+    """
+    match = _YEAR_RANGE_RE.match(value)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    return None
+
+
+# OSM date tags: "1880", "~1880", "1880s", "1880-1890", etc.
+_OSM_DATE_RE = re.compile(r'^~?(\d{4})')
+
+
+@lru_cache(maxsize=4096)
+def _parse_osm_date_str(value: str) -> Optional[int]:
+    value = value.strip()
+    # Fast path: plain years and ISO dates ("1880", "1880-05-17")
+    head = value[:4]
+    if len(head) == 4 and head.isdecimal():
+        return int(head)
+    match = _OSM_DATE_RE.match(value)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def parse_osm_date(value: Any) -> Optional[int]:
+    """
+    Parse an OSM date tag (start_date, construction_date, ...) to a year.
+
+    Only the leading year is used, optionally prefixed with "~". String
+    results are cached: the same few year strings repeat across thousands
+    of ways in an OSM extract.
+
+    Args:
+        value: Tag value (usually a string)
+
+    Returns:
+        Integer year or None
+
+    Examples:
+        >>> parse_osm_date("1880")
+        1880
+        >>> parse_osm_date("~1880s")
+        1880
+        >>> parse_osm_date("1880-05-17")
+        1880
+        >>> parse_osm_date(1880)
+        1880
+        >>> parse_osm_date("ca. 1880") is None
+        True
+    """
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return _parse_osm_date_str(value)
+    return None
+
+
 def normalize_year_to_int(value: Union[str, int, float, None]) -> Optional[int]:
     """
     Alias for parse_year() for backwards compatibility.
@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from .base_road import BaseRoadNormalizer
+from .date_utils import clean_date_string
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,7 +40,7 @@ class Normalizer(BaseRoadNormalizer):
         if not date_str:
             return None
 
-        date_str = str(date_str).lower().strip()
+        date_str = clean_date_string(str(date_str))
 
         # Direct year match
         match = re.search(r'\b(\d{4})\b', date_str)
@@ -176,6 +177,11 @@ class Normalizer(BaseRoadNormalizer):
             # Calculate length
             length = self.calculate_length(geom)
 
+            # Truncate long descriptions
+            beskrivelse = props.get('beskrivelse') or ''
+            if len(beskrivelse) > 500:
+                beskrivelse = beskrivelse[:500]
+
             # Create normalized feature
             feature = self.create_normalized_road_feature(
                 src_id=src_id,
@@ -190,7 +196,7 @@ class Normalizer(BaseRoadNormalizer):
                     'heritage_id': heritage_id,
                     'vernetype': props.get('vernetype'),
                     'kategori': props.get('kategori'),
-                    'beskrivelse': props.get('beskrivelse', '')[:500],  # Truncate
+                    'beskrivelse': beskrivelse,
                     'kommune': props.get('kommune'),
                     'fredningsstatus': props.get('fredningsstatus'),
                 }
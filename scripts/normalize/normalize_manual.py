@@ -10,18 +10,51 @@ Manual entries have full provenance tracking:
 These are preserved in _raw for audit trails.
 """
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from base import BaseNormalizer
+from base import BaseNormalizer, load_json
+
+
+# Map use to building type (bt)
+USE_TO_BT = {
+    'residential': 'residential',
+    'commercial': 'commercial',
+    'industrial': 'industrial',
+    'public': 'public',
+    'religious': 'religious',
+    'military': 'military',
+    'agricultural': 'agricultural',
+    'transport': 'transport',
+    'utility': 'utility',
+}
+
+# Properties preserved in _raw for audit trails
+RAW_PROP_KEYS = (
+    'addr', 'use', 'notes', 'tags',
+    # Evidence details
+    'ev_src', 'ev_url', 'ev_note',
+    # Provenance
+    'added_by', 'added_at',
+    'verified', 'verified_by', 'verified_at',
+    'modified_by', 'modified_at',
+)
 
 
 class Normalizer(BaseNormalizer):
     """Normalizer for manual building entries."""
 
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None, keep_provenance: bool = True):
+        """
+        Initialize manual normalizer.
+
+        Args:
+            data_dir: Data directory
+            keep_provenance: Preserve provenance/audit fields in _raw. Disable
+                for compact output when the audit trail is not needed.
+        """
         super().__init__('manual', data_dir)
+        self.keep_provenance = keep_provenance
 
     def normalize(self) -> List[Dict]:
         """
@@ -36,10 +69,15 @@ class Normalizer(BaseNormalizer):
             print(f"  No raw data found at {raw_path}")
             return []
 
-        with open(raw_path) as f:
-            raw_data = json.load(f)
+        raw_data = load_json(raw_path)
 
         features = []
+        keep_provenance = self.keep_provenance
+
+        # Bind per-feature lookups once outside the loop
+        create_feature = self.create_normalized_feature
+        append_feature = features.append
+
         for feat in raw_data.get('features', []):
             props = feat.get('properties', {})
             geometry = feat.get('geometry')
@@ -49,51 +87,28 @@ class Normalizer(BaseNormalizer):
                 continue
 
             # Extract normalized fields
-            src_id = props.get('id', f"man_{len(features):04d}")
+            src_id = props.get('id')
+            if src_id is None:
+                src_id = f"man_{len(features):04d}"
             sd = props.get('sd')
             ed = props.get('ed')
             ev = props.get('ev', 'm')  # Default to medium evidence
             nm = props.get('nm')
 
             # Map use to building type (bt)
-            use_to_bt = {
-                'residential': 'residential',
-                'commercial': 'commercial',
-                'industrial': 'industrial',
-                'public': 'public',
-                'religious': 'religious',
-                'military': 'military',
-                'agricultural': 'agricultural',
-                'transport': 'transport',
-                'utility': 'utility',
-            }
-            bt = use_to_bt.get(props.get('use'))
-
-            # Preserve full provenance in _raw
-            raw_props = {
-                'addr': props.get('addr'),
-                'use': props.get('use'),
-                'notes': props.get('notes'),
-                'tags': props.get('tags'),
-                # Evidence details
-                'ev_src': props.get('ev_src'),
-                'ev_url': props.get('ev_url'),
-                'ev_note': props.get('ev_note'),
-                # Provenance
-                'added_by': props.get('added_by'),
-                'added_at': props.get('added_at'),
-                'verified': props.get('verified'),
-                'verified_by': props.get('verified_by'),
-                'verified_at': props.get('verified_at'),
-                'modified_by': props.get('modified_by'),
-                'modified_at': props.get('modified_at'),
-            }
-
-            # Remove None values from raw_props
-            raw_props = {k: v for k, v in raw_props.items() if v is not None}
+            bt = USE_TO_BT.get(props.get('use'))
+
+            # Preserve full provenance in _raw, skipping None values
+            raw_props = None
+            if keep_provenance:
+                raw_props = {}
+                for key in RAW_PROP_KEYS:
+                    value = props.get(key)
+                    if value is not None:
+                        raw_props[key] = value
 
             # Create normalized feature
-            normalized = self.create_normalized_feature(
+            normalized = create_feature(
                 src_id=src_id,
                 geometry=geometry,
                 sd=sd,
@@ -104,7 +119,7 @@ class Normalizer(BaseNormalizer):
                 raw_props=raw_props if raw_props else None
             )
 
-            features.append(normalized)
+            append_feature(normalized)
 
         return features
 
@@ -117,10 +132,15 @@ def main():
     parser.add_argument('--data-dir', '-d', type=Path,
                         default=Path(__file__).parent.parent.parent / 'data',
                         help='Data directory')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Write newline-delimited GeoJSON output')
+    parser.add_argument('--no-provenance', action='store_true',
+                        help='Omit provenance/audit fields (_raw) from output')
     args = parser.parse_args()
 
-    normalizer = Normalizer(data_dir=args.data_dir)
-    success = normalizer.run()
+    normalizer = Normalizer(data_dir=args.data_dir,
+                            keep_provenance=not args.no_provenance)
+    success = normalizer.run(ndjson=args.ndjson)
     exit(0 if success else 1)
 
 
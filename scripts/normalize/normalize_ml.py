@@ -5,14 +5,20 @@ ML-detected building data normalization.
 Converts ML-extracted building polygons from historical maps to normalized GeoJSON schema.
 """
 
-import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .base import BaseNormalizer
+from .base import BaseNormalizer, iter_geojson_features
 
+_RE_YEAR4 = re.compile(r'(\d{4})')
 
+
+@lru_cache(maxsize=256)
 def parse_map_date_from_source_id(source_id: str) -> Optional[int]:
     """
     Parse map date from source ID.
@@ -29,12 +35,13 @@ def parse_map_date_from_source_id(source_id: str) -> Optional[int]:
         Year as integer, or None if not parseable
     """
     # Match patterns like '_1880', '_1947', 'kv1904', etc.
-    match = re.search(r'(\d{4})', source_id)
+    match = _RE_YEAR4.search(source_id)
     if match:
         return int(match.group(1))
     return None
 
 
+@lru_cache(maxsize=256)
 def parse_map_source_code(source_id: str) -> str:
     """
     Extract map source code from source ID.
@@ -51,10 +58,11 @@ def parse_map_source_code(source_id: str) -> str:
         Short map source code
     """
     # Extract components
-    if 'kartverket' in source_id.lower():
+    sid = source_id.lower()
+    if 'kartverket' in sid:
         year = parse_map_date_from_source_id(source_id)
         return f'kv{year}' if year else 'kv_unknown'
-    elif 'aerial' in source_id.lower() or 'air' in source_id.lower():
+    elif 'aerial' in sid or 'air' in sid:
         year = parse_map_date_from_source_id(source_id)
         return f'air{year}' if year else 'air_unknown'
     else:
@@ -136,33 +144,34 @@ class Normalizer(BaseNormalizer):
 
         features = []
 
+        # Bind per-feature lookups once outside the loop
+        create_feature = self.create_normalized_feature
+        append_feature = features.append
+
         for raw_file in raw_files:
-            with open(raw_file) as f:
-                data = json.load(f)
-
-            # Handle both FeatureCollection and single features
-            if data.get('type') == 'FeatureCollection':
-                raw_features = data.get('features', [])
-            elif data.get('type') == 'Feature':
-                raw_features = [data]
-            else:
+            # Handles both FeatureCollection and single features
+            raw_features = iter_geojson_features(raw_file)
+            if raw_features is None:
                 print(f"  Warning: Unrecognized GeoJSON type in {raw_file.name}")
                 continue
 
             for feat in raw_features:
                 props = feat.get('properties', {})
-                geometry = feat.get('geometry')
-
-                if not geometry:
-                    continue
 
-                # Only process buildings (class_id == 1 or class == 'building')
+                # Only process buildings (class_id == 1 or class == 'building');
+                # checked before touching the (much larger) geometry
                 class_id = props.get('class_id')
-                class_name = props.get('class', '').lower()
+                class_name = props.get('class') or ''
+                if not class_name.islower():
+                    class_name = class_name.lower()  # copy only when needed
 
                 if class_id != 1 and class_name != 'building':
                     continue
 
+                geometry = feat.get('geometry')
+                if not geometry:
+                    continue
+
                 # Extract confidence score
                 confidence = props.get('confidence', confidence_threshold)
 
@@ -170,11 +179,15 @@ class Normalizer(BaseNormalizer):
                 ev = confidence_to_evidence_level(confidence)
 
                 # Generate source-specific ID
-                feature_id = props.get('feature_id', props.get('id', f'unknown_{len(features)}'))
+                feature_id = props.get('feature_id')
+                if feature_id is None:
+                    feature_id = props.get('id')
+                if feature_id is None:
+                    feature_id = f'unknown_{len(features)}'
                 src_id = f"{ml_src_code}_{feature_id}"
 
                 # Create normalized feature
-                feature = self.create_normalized_feature(
+                feature = create_feature(
                     src_id=src_id,
                     geometry=geometry,
                     sd=reference_year,  # Building existed by this date
@@ -196,13 +209,18 @@ class Normalizer(BaseNormalizer):
                 feature['properties']['mlc'] = confidence
                 feature['properties']['ml_src'] = ml_src_code
 
-                features.append(feature)
+                append_feature(feature)
 
         print(f"  Found {len(features)} building features")
 
         return features
 
 
+def _run_map_source(map_source: str, data_dir: Path, ndjson: bool = False) -> bool:
+    """Normalize a single map source (process pool worker)."""
+    return Normalizer(map_source=map_source, data_dir=data_dir).run(ndjson=ndjson)
+
+
 def main():
     """CLI entry point."""
     import argparse
@@ -231,6 +249,19 @@ Examples:
         help='Normalize all ML-detected sources in ml_detected directory'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Parallel worker processes for --all (default: 1, 0 = CPU count)'
+    )
+
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Write newline-delimited GeoJSON output'
+    )
+
     parser.add_argument(
         '--data-dir',
         type=Path,
@@ -256,10 +287,13 @@ Examples:
             return 1
 
         # Find subdirectories with manifest.json
-        map_sources = [
-            d.name for d in ml_detected_dir.iterdir()
-            if d.is_dir() and (d / 'manifest.json').exists()
-        ]
+        # (scandir reuses the cached dirent type instead of a stat per entry)
+        with os.scandir(ml_detected_dir) as entries:
+            map_sources = [
+                entry.name for entry in entries
+                if entry.is_dir()
+                and os.path.exists(os.path.join(entry.path, 'manifest.json'))
+            ]
 
         if not map_sources:
             print(f"No ML-detected map sources found in {ml_detected_dir}")
@@ -270,12 +304,17 @@ Examples:
             print(f"  - {src}")
         print()
 
-        # Process each source
-        success_count = 0
-        for map_source in map_sources:
-            normalizer = Normalizer(map_source=map_source, data_dir=data_dir)
-            if normalizer.run():
-                success_count += 1
+        # Process sources in parallel; each one reads and writes only its own directory
+        if len(map_sources) > 1 and args.workers != 1:
+            with ProcessPoolExecutor(max_workers=args.workers or None) as executor:
+                results = list(executor.map(
+                    _run_map_source, map_sources, repeat(data_dir), repeat(args.ndjson)
+                ))
+        else:
+            results = [
+                _run_map_source(map_source, data_dir, args.ndjson) for map_source in map_sources
+            ]
+        success_count = sum(results)
 
         print(f"\nSuccessfully normalized {success_count}/{len(map_sources)} source(s)")
         return 0 if success_count == len(map_sources) else 1
@@ -283,7 +322,7 @@ Examples:
     else:
         # Process single map source
         normalizer = Normalizer(map_source=args.map_source, data_dir=data_dir)
-        success = normalizer.run()
+        success = normalizer.run(ndjson=args.ndjson)
         return 0 if success else 1
 
 
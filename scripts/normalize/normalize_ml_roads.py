@@ -6,14 +6,24 @@ Converts ML-extracted road centerlines from historical maps to normalized GeoJSO
 Roads are extracted as class_id=2 by the ML pipeline (ml/vectorize.py).
 """
 
-import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .base import iter_geojson_features
 from .base_road import BaseRoadNormalizer
 
+_RE_YEAR4 = re.compile(r'(\d{4})')
 
+# Geometry types accepted as roads
+LINE_TYPES = frozenset(('LineString', 'MultiLineString'))
+
+
+@lru_cache(maxsize=256)
 def parse_map_date_from_source_id(source_id: str) -> Optional[int]:
     """
     Parse map date from source ID.
@@ -23,12 +33,13 @@ def parse_map_date_from_source_id(source_id: str) -> Optional[int]:
         'ml_aerial_1947' -> 1947
         'ml_kv1904' -> 1904
     """
-    match = re.search(r'(\d{4})', source_id)
+    match = _RE_YEAR4.search(source_id)
     if match:
         return int(match.group(1))
     return None
 
 
+@lru_cache(maxsize=256)
 def parse_map_source_code(source_id: str) -> str:
     """
     Extract map source code from source ID.
@@ -37,10 +48,11 @@ def parse_map_source_code(source_id: str) -> str:
         'ml_kartverket_1880' -> 'kv1880'
         'ml_aerial_1947' -> 'air1947'
     """
-    if 'kartverket' in source_id.lower():
+    sid = source_id.lower()
+    if 'kartverket' in sid:
         year = parse_map_date_from_source_id(source_id)
         return f'kv{year}' if year else 'kv_unknown'
-    elif 'aerial' in source_id.lower() or 'air' in source_id.lower():
+    elif 'aerial' in sid or 'air' in sid:
         year = parse_map_date_from_source_id(source_id)
         return f'air{year}' if year else 'air_unknown'
     else:
@@ -126,35 +138,36 @@ class Normalizer(BaseRoadNormalizer):
 
         features = []
 
+        # Bind per-feature lookups once outside the loop
+        create_feature = self.create_normalized_road_feature
+        append_feature = features.append
+
         for raw_file in raw_files:
-            with open(raw_file) as f:
-                data = json.load(f)
-
-            # Handle both FeatureCollection and single features
-            if data.get('type') == 'FeatureCollection':
-                raw_features = data.get('features', [])
-            elif data.get('type') == 'Feature':
-                raw_features = [data]
-            else:
+            # Handles both FeatureCollection and single features
+            raw_features = iter_geojson_features(raw_file)
+            if raw_features is None:
                 print(f"  Warning: Unrecognized GeoJSON type in {raw_file.name}")
                 continue
 
             for feat in raw_features:
                 props = feat.get('properties', {})
-                geometry = feat.get('geometry')
 
-                if not geometry:
-                    continue
-
-                # Only process roads (class_id == 2 or class == 'road')
+                # Only process roads (class_id == 2 or class == 'road');
+                # checked before touching the (much larger) geometry
                 class_id = props.get('class_id')
-                class_name = props.get('class', '').lower()
+                class_name = props.get('class') or ''
+                if not class_name.islower():
+                    class_name = class_name.lower()  # copy only when needed
 
                 if class_id != self.ROAD_CLASS_ID and class_name != 'road':
                     continue
 
+                geometry = feat.get('geometry')
+                if not geometry:
+                    continue
+
                 # Only process LineString or MultiLineString geometries
-                if geometry.get('type') not in ('LineString', 'MultiLineString'):
+                if geometry.get('type') not in LINE_TYPES:
                     continue
 
                 # Extract confidence score
@@ -164,11 +177,15 @@ class Normalizer(BaseRoadNormalizer):
                 ev = confidence_to_evidence_level(confidence)
 
                 # Generate source-specific ID
-                feature_id = props.get('feature_id', props.get('id', f'road_{len(features)}'))
+                feature_id = props.get('feature_id')
+                if feature_id is None:
+                    feature_id = props.get('id')
+                if feature_id is None:
+                    feature_id = f'road_{len(features)}'
                 src_id = f"{ml_src_code}_road_{feature_id}"
 
                 # Create normalized feature
-                feature = self.create_normalized_road_feature(
+                feature = create_feature(
                     src_id=src_id,
                     geometry=geometry,
                     sd=reference_year,  # Road existed by this date
@@ -176,7 +193,6 @@ class Normalizer(BaseRoadNormalizer):
                     ev=ev,
                     nm=None,  # ML detections don't have names
                     rt='historical',  # Mark as historical road
-                    length=self.calculate_length(geometry),
                     raw_props={
                         'ml_confidence': confidence,
                         'ml_src': ml_src_code,
@@ -191,13 +207,21 @@ class Normalizer(BaseRoadNormalizer):
                 feature['properties']['mlc'] = confidence
                 feature['properties']['ml_src'] = ml_src_code
 
-                features.append(feature)
+                append_feature(feature)
+
+        # Lengths for all roads in one vectorized batch
+        self.assign_lengths(features)
 
         print(f"  Found {len(features)} road features")
 
         return features
 
 
+def _run_map_source(map_source: str, data_dir: Path, ndjson: bool = False) -> bool:
+    """Normalize a single map source (process pool worker)."""
+    return Normalizer(map_source=map_source, data_dir=data_dir).run(ndjson=ndjson)
+
+
 def main():
     """CLI entry point."""
     import argparse
@@ -226,6 +250,19 @@ Examples:
         help='Normalize all ML-detected sources in ml_detected directory'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Parallel worker processes for --all (default: 1, 0 = CPU count)'
+    )
+
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Write newline-delimited GeoJSON output'
+    )
+
     parser.add_argument(
         '--data-dir',
         type=Path,
@@ -251,10 +288,13 @@ Examples:
             return 1
 
         # Find subdirectories with manifest.json
-        map_sources = [
-            d.name for d in ml_detected_dir.iterdir()
-            if d.is_dir() and (d / 'manifest.json').exists()
-        ]
+        # (scandir reuses the cached dirent type instead of a stat per entry)
+        with os.scandir(ml_detected_dir) as entries:
+            map_sources = [
+                entry.name for entry in entries
+                if entry.is_dir()
+                and os.path.exists(os.path.join(entry.path, 'manifest.json'))
+            ]
 
         if not map_sources:
             print(f"No ML-detected map sources found in {ml_detected_dir}")
@@ -265,12 +305,17 @@ Examples:
             print(f"  - {src}")
         print()
 
-        # Process each source
-        success_count = 0
-        for map_source in map_sources:
-            normalizer = Normalizer(map_source=map_source, data_dir=data_dir)
-            if normalizer.run():
-                success_count += 1
+        # Process sources in parallel; each one reads and writes only its own directory
+        if len(map_sources) > 1 and args.workers != 1:
+            with ProcessPoolExecutor(max_workers=args.workers or None) as executor:
+                results = list(executor.map(
+                    _run_map_source, map_sources, repeat(data_dir), repeat(args.ndjson)
+                ))
+        else:
+            results = [
+                _run_map_source(map_source, data_dir, args.ndjson) for map_source in map_sources
+            ]
+        success_count = sum(results)
 
         print(f"\nSuccessfully normalized {success_count}/{len(map_sources)} source(s)")
         return 0 if success_count == len(map_sources) else 1
@@ -278,7 +323,7 @@ Examples:
     else:
         # Process single map source
         normalizer = Normalizer(map_source=args.map_source, data_dir=data_dir)
-        success = normalizer.run()
+        success = normalizer.run(ndjson=args.ndjson)
         return 0 if success else 1
 
 
@@ -5,18 +5,27 @@ NVDB road data normalizer.
 Transforms raw NVDB road data to the normalized road schema.
 """
 
-import json
 import logging
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from .base import load_json
 from .base_road import BaseRoadNormalizer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Date formats seen in NVDB attributes: YYYY-MM-DD, DD.MM.YYYY or YYYY
+_RE_DATE = re.compile(
+    r'^(?:(?P<ymd>\d{4})-\d{2}-\d{2}'
+    r'|\d{2}\.\d{2}\.(?P<dmy>\d{4})'
+    r'|(?P<y>\d{4})$)'
+)
+
+
 # NVDB road category to normalized road type mapping
 NVDB_CATEGORY_MAP = {
     'E': 'motorway',      # Europaveg
@@ -27,6 +36,22 @@ NVDB_CATEGORY_MAP = {
     'S': 'track',         # Skogsveg
 }
 
+# Geometry types accepted as roads
+LINE_TYPES = frozenset(('LineString', 'MultiLineString'))
+
+# Property columns written to the GeoParquet sidecar
+PARQUET_COLUMNS = ('_src_id', 'sd', 'ed', 'rt', 'len', 'nm', 'nvdb_id')
+
+# NVDB road category to road name prefix (private/forest roads get no name)
+NVDB_NAME_PREFIX_MAP = {
+    'E': 'E',
+    'R': 'Rv',
+    'F': 'Fv',
+    'K': 'Kv',
+    'P': '',
+    'S': '',
+}
+
 # NVDB typeVeg mapping
 NVDB_TYPE_MAP = {
     'kanalisertVeg': 'motorway',
@@ -41,50 +66,81 @@ NVDB_TYPE_MAP = {
 }
 
 
-class Normalizer(BaseRoadNormalizer):
-    """NVDB road data normalizer."""
+def parse_nvdb_date(date_str: Any) -> Optional[int]:
+    """
+    Parse NVDB date string to year.
 
-    def __init__(self, **kwargs):
-        super().__init__('nvdb', **kwargs)
+    Handles formats like:
+    - "2015-01-01"
+    - "2015"
+    - "01.01.2015"
 
-    def _parse_date(self, date_str: Optional[str]) -> Optional[int]:
-        """
-        Parse NVDB date string to year.
+    Numbers are parsed from their string form; other values (None, lists,
+    dicts) give None.
+    """
+    if isinstance(date_str, (int, float)):
+        date_str = str(date_str)
+    elif not isinstance(date_str, str):
+        return None
+    return _parse_nvdb_date_str(date_str)
 
-        Handles formats like:
-        - "2015-01-01"
-        - "2015"
-        - "01.01.2015"
-        """
-        if not date_str:
-            return None
 
-        date_str = str(date_str).strip()
+@lru_cache(maxsize=4096)
+def _parse_nvdb_date_str(date_str: str) -> Optional[int]:
+    """
+    Parse a date string for parse_nvdb_date().
+
+    Cached because a national dump repeats the same registration and
+    construction dates across thousands of segments; only called with
+    (hashable) strings.
+    """
+    if not date_str:
+        return None
 
-        # Try YYYY-MM-DD
-        match = re.match(r'^(\d{4})-\d{2}-\d{2}', date_str)
-        if match:
-            return int(match.group(1))
+    date_str = date_str.strip()
 
-        # Try DD.MM.YYYY
-        match = re.match(r'^\d{2}\.\d{2}\.(\d{4})', date_str)
-        if match:
-            return int(match.group(1))
+    # Fast paths for the common "YYYY" and "YYYY-MM-DD..." forms, no regex
+    if len(date_str) == 4 and date_str.isdecimal():
+        return int(date_str)
+    if (len(date_str) >= 10 and date_str[4] == '-' and date_str[7] == '-'
+            and date_str[:4].isdecimal() and date_str[5:7].isdecimal()
+            and date_str[8:10].isdecimal()):
+        return int(date_str[:4])
 
-        # Try just YYYY
-        match = re.match(r'^(\d{4})$', date_str)
-        if match:
-            return int(match.group(1))
+    # Try YYYY-MM-DD, DD.MM.YYYY and YYYY in a single match
+    match = _RE_DATE.match(date_str)
+    if match:
+        return int(match.group('ymd') or match.group('dmy') or match.group('y'))
 
-        # Try numeric value
-        try:
-            year = int(float(date_str))
-            if 1800 <= year <= 2100:
-                return year
-        except (ValueError, TypeError):
-            pass
+    # Try numeric value
+    try:
+        year = int(float(date_str))
+        if 1800 <= year <= 2100:
+            return year
+    except (ValueError, TypeError):
+        pass
 
-        return None
+    return None
+
+
+class Normalizer(BaseRoadNormalizer):
+    """NVDB road data normalizer."""
+
+    def __init__(self, parquet: bool = False, **kwargs):
+        """
+        Initialize NVDB normalizer.
+
+        Args:
+            parquet: Also write normalized roads as columnar GeoParquet
+                (roads.parquet, requires geopandas and pyarrow)
+            **kwargs: Additional arguments passed to BaseRoadNormalizer
+        """
+        super().__init__('nvdb', **kwargs)
+        self.parquet = parquet
+
+    def _parse_date(self, date_str: Optional[str]) -> Optional[int]:
+        """Parse NVDB date string to year (see parse_nvdb_date)."""
+        return parse_nvdb_date(date_str)
 
     def _map_road_type(self, props: Dict) -> str:
         """Map NVDB properties to normalized road type."""
@@ -102,25 +158,50 @@ class Normalizer(BaseRoadNormalizer):
 
     def _generate_road_name(self, props: Dict) -> Optional[str]:
         """Generate road name from NVDB properties."""
-        vegkategori = props.get('vegkategori', '')
         vegnummer = props.get('vegnummer')
+        if not vegnummer:
+            return None
 
-        if vegkategori and vegnummer:
-            # E.g., "E6", "Rv706", "Fv704"
-            prefix_map = {
-                'E': 'E',
-                'R': 'Rv',
-                'F': 'Fv',
-                'K': 'Kv',
-                'P': '',
-                'S': ''
-            }
-            prefix = prefix_map.get(vegkategori, '')
-            if prefix:
-                return f"{prefix}{vegnummer}"
+        # E.g., "E6", "Rv706", "Fv704"
+        prefix = NVDB_NAME_PREFIX_MAP.get(props.get('vegkategori'))
+        if prefix:
+            return f"{prefix}{vegnummer}"
 
         return None
 
+    def write_geoparquet(self, features: List[Dict], path: Path) -> bool:
+        """
+        Write normalized roads as a columnar GeoParquet file.
+
+        Temporal and classification attributes become typed columns next to
+        a single geometry column, so downstream aggregation can read just the
+        columns it needs instead of re-parsing GeoJSON.
+
+        Returns:
+            True if written, False if geopandas/pyarrow are not available
+        """
+        try:
+            import geopandas as gpd
+            import pyarrow  # noqa: F401  (Parquet engine)
+            from shapely.geometry import shape
+        except ImportError:
+            logger.warning("geopandas/pyarrow not installed, skipping GeoParquet output")
+            return False
+
+        columns = {
+            column: [f['properties'].get(column) for f in features]
+            for column in PARQUET_COLUMNS
+        }
+        gdf = gpd.GeoDataFrame(
+            columns,
+            geometry=[shape(f['geometry']) for f in features],
+            crs='EPSG:4326'
+        ).astype({'sd': 'Int64', 'ed': 'Int64'})
+        gdf.to_parquet(path)
+
+        logger.info(f"  GeoParquet: {path}")
+        return True
+
     def normalize(self) -> List[Dict]:
         """Normalize NVDB road data to common schema."""
         raw_file = self.raw_dir / 'nvdb_roads.json'
@@ -129,19 +210,29 @@ class Normalizer(BaseRoadNormalizer):
             logger.error(f"Raw file not found: {raw_file}")
             return []
 
-        with open(raw_file) as f:
-            raw_data = json.load(f)
+        raw_data = load_json(raw_file)
 
         features = []
         raw_features = raw_data.get('features', [])
 
         logger.info(f"Normalizing {len(raw_features)} NVDB road features...")
 
+        # Statistics, accumulated in the main loop
+        with_dates = 0
+        by_type = {}
+
+        # Bind per-feature lookups once outside the loop
+        parse_date = self._parse_date
+        map_road_type = self._map_road_type
+        generate_road_name = self._generate_road_name
+        create_feature = self.create_normalized_road_feature
+        append_feature = features.append
+
         for raw_feat in raw_features:
             props = raw_feat.get('properties', {})
             geom = raw_feat.get('geometry')
 
-            if not geom or geom['type'] not in ('LineString', 'MultiLineString'):
+            if not geom or geom['type'] not in LINE_TYPES:
                 continue
 
             # Generate source ID
@@ -152,35 +243,33 @@ class Normalizer(BaseRoadNormalizer):
             # Extract/derive dates
             # NVDB may have startdato (when segment was added to database)
             # and construction_year from enriched tunnel/bridge data
-            start_date = self._parse_date(props.get('construction_year'))
+            start_date = parse_date(props.get('construction_year'))
 
             # If no explicit construction year, try startdato
             # but be careful - startdato may just be when it was registered
             if not start_date:
-                startdato = self._parse_date(props.get('startdato'))
+                startdato = parse_date(props.get('startdato'))
                 # Only use if it looks like a plausible construction date
                 if startdato and startdato < 2000:
                     start_date = startdato
 
             # End date (road removed/rerouted)
-            end_date = self._parse_date(props.get('sluttdato'))
+            end_date = parse_date(props.get('sluttdato'))
 
             # Road type
-            road_type = self._map_road_type(props)
+            road_type = map_road_type(props)
 
             # Road name
-            road_name = self._generate_road_name(props)
+            road_name = generate_road_name(props)
 
-            # Calculate length
+            # Length from NVDB; missing ones are computed in one batch below
             length = props.get('lengde')
-            if length is None:
-                length = self.calculate_length(geom)
 
             # Evidence is HIGH for NVDB (official government database)
             evidence = 'h'
 
             # Create normalized feature
-            feature = self.create_normalized_road_feature(
+            feature = create_feature(
                 src_id=src_id,
                 geometry=geom,
                 sd=start_date,
@@ -199,24 +288,38 @@ class Normalizer(BaseRoadNormalizer):
                 }
             )
 
-            features.append(feature)
+            append_feature(feature)
+
+            if start_date:
+                with_dates += 1
+            by_type[road_type] = by_type.get(road_type, 0) + 1
+
+        self.assign_lengths(features)
 
         logger.info(f"Normalized {len(features)} road features")
 
         # Log statistics
-        with_dates = sum(1 for f in features if f['properties'].get('sd'))
-        by_type = {}
-        for f in features:
-            rt = f['properties'].get('rt', 'unknown')
-            by_type[rt] = by_type.get(rt, 0) + 1
-
         logger.info(f"  Roads with dates: {with_dates}")
         logger.info(f"  By type: {by_type}")
 
         return features
 
+    def write_extra_outputs(self, features: List[Dict]) -> None:
+        """Write the GeoParquet sidecar from the validated features (--parquet)."""
+        if self.parquet:
+            self.write_geoparquet(features, self.normalized_dir / 'roads.parquet')
+
 
 # Allow running directly
 if __name__ == '__main__':
-    normalizer = Normalizer()
-    normalizer.run()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Normalize NVDB road data')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Write newline-delimited GeoJSON output')
+    parser.add_argument('--parquet', action='store_true',
+                        help='Also write columnar GeoParquet (requires geopandas and pyarrow)')
+    args = parser.parse_args()
+
+    normalizer = Normalizer(parquet=args.parquet)
+    normalizer.run(ndjson=args.ndjson)
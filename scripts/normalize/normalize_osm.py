@@ -5,27 +5,15 @@ OSM building data normalization.
 Converts raw Overpass API output to normalized GeoJSON schema.
 """
 
-import json
-import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Dict, List
 
-from .base import BaseNormalizer
+from .base import BaseNormalizer, load_json, should_stream, stream_json_items
+from .date_utils import parse_osm_date as parse_date
+from .osm_nodes import NodeIndex
 
-
-def parse_date(value: Any) -> Optional[int]:
-    """Parse various date formats to year integer."""
-    if value is None:
-        return None
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        value = value.strip()
-        # Match "1880", "~1880", "1880s", "1880-1890", etc.
-        match = re.match(r'^~?(\d{4})', value)
-        if match:
-            return int(match.group(1))
-    return None
+# Date tags in order of preference
+DATE_KEYS = ('start_date', 'building:start_date', 'construction_date')
 
 
 class Normalizer(BaseNormalizer):
@@ -41,39 +29,52 @@ class Normalizer(BaseNormalizer):
         if not raw_file.exists():
             raise FileNotFoundError(f"Raw file not found: {raw_file}")
 
-        with open(raw_file) as f:
-            data = json.load(f)
-
-        elements = data.get('elements', [])
-
-        # Build node lookup for geometry construction
-        nodes = {}
+        if should_stream(raw_file):
+            # Large extract: stream elements so only the node lookup and
+            # the building ways are held in memory, not every element
+            elements = stream_json_items(raw_file, 'elements.item')
+        else:
+            elements = load_json(raw_file).get('elements', [])
+
+        # Single pass over elements: build the node lookup for geometry
+        # construction and set aside building ways. Overpass output order is
+        # not guaranteed, so ways are resolved once all nodes are known.
+        nodes = NodeIndex()
+        add_node = nodes.add
+        ways = []
+        add_way = ways.append
         for el in elements:
-            if el.get('type') == 'node':
-                nodes[el['id']] = (el['lon'], el['lat'])
+            el_type = el.get('type')
+            if el_type == 'node':
+                add_node(el['id'], el['lon'], el['lat'])
+            elif el_type == 'way':
+                tags = el.get('tags')
+                if tags and 'building' in tags:
+                    add_way(el)
+        nodes.freeze()
 
         # Process ways (buildings)
         features = []
-        for el in elements:
-            if el.get('type') != 'way':
-                continue
-
-            tags = el.get('tags', {})
-            if 'building' not in tags:
-                continue
+        # Bind per-feature lookups once outside the loop
+        create_feature = self.create_normalized_feature
+        append_feature = features.append
+        for el in ways:
+            tags = el['tags']
 
             # Build geometry from node refs
-            node_refs = el.get('nodes', [])
-            coords = []
-            for ref in node_refs:
-                if ref in nodes:
-                    coords.append(list(nodes[ref]))
+            node_refs = el.get('nodes')
+            if not node_refs or len(node_refs) < 4:  # Too few refs for 3 points + closing
+                continue
+            coords = nodes.resolve(node_refs)
 
             if len(coords) < 4:  # Need at least 3 points + closing
                 continue
 
-            # Ensure polygon is closed
-            if coords[0] != coords[-1]:
+            # Ensure polygon is closed. A way whose first and last node refs
+            # match is closed already (an int compare), unless some of its
+            # nodes were missing from the extract; only then compare coords.
+            closed = node_refs[0] == node_refs[-1] and len(coords) == len(node_refs)
+            if not closed and coords[0] != coords[-1]:
                 coords.append(coords[0])
 
             geometry = {
@@ -85,9 +86,10 @@ class Normalizer(BaseNormalizer):
             start_date = None
             has_explicit_date = False
 
-            for date_key in ['start_date', 'building:start_date', 'construction_date']:
-                if date_key in tags:
-                    start_date = parse_date(tags[date_key])
+            for date_key in DATE_KEYS:
+                value = tags.get(date_key)
+                if value is not None:
+                    start_date = parse_date(value)
                     if start_date:
                         has_explicit_date = True
                         break
@@ -97,7 +99,7 @@ class Normalizer(BaseNormalizer):
             ev = 'h' if has_explicit_date else 'l'
 
             # Create normalized feature
-            feature = self.create_normalized_feature(
+            feature = create_feature(
                 src_id=f"way/{el['id']}",
                 geometry=geometry,
                 sd=start_date,
@@ -110,7 +112,7 @@ class Normalizer(BaseNormalizer):
                 }
             )
 
-            features.append(feature)
+            append_feature(feature)
 
         return features
 
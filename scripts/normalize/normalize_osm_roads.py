@@ -5,27 +5,16 @@ OSM road data normalization.
 Converts raw Overpass API output to normalized road GeoJSON schema.
 """
 
-import json
-import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Dict, List
 
+from .base import load_json, should_stream, stream_json_items
 from .base_road import BaseRoadNormalizer
+from .date_utils import parse_osm_date as parse_date
+from .osm_nodes import NodeIndex
 
-
-def parse_date(value: Any) -> Optional[int]:
-    """Parse various date formats to year integer."""
-    if value is None:
-        return None
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        value = value.strip()
-        # Match "1880", "~1880", "1880s", "1880-1890", etc.
-        match = re.match(r'^~?(\d{4})', value)
-        if match:
-            return int(match.group(1))
-    return None
+# Date tags in order of preference (nvdb:date marks an authoritative NVDB date)
+DATE_KEYS = ('start_date', 'construction_date', 'nvdb:date', 'opening_date')
 
 
 # OSM highway type to normalized road type mapping
@@ -52,6 +41,15 @@ OSM_HIGHWAY_MAP = {
 }
 
 
+# OSM tags preserved in _raw. A tuple (not a set) so the output key order
+# is deterministic; checking these against the tags dict is cheaper than
+# scanning every tag on tag-heavy ways.
+ROAD_TAG_KEEP = (
+    'name', 'ref', 'highway', 'surface', 'lanes',
+    'maxspeed', 'oneway', 'bridge', 'tunnel',
+)
+
+
 class Normalizer(BaseRoadNormalizer):
     """OSM road data normalizer."""
 
@@ -65,33 +63,43 @@ class Normalizer(BaseRoadNormalizer):
         if not raw_file.exists():
             raise FileNotFoundError(f"Raw file not found: {raw_file}")
 
-        with open(raw_file) as f:
-            data = json.load(f)
-
-        elements = data.get('elements', [])
-
-        # Build node lookup for geometry construction
-        nodes = {}
+        if should_stream(raw_file):
+            # Large extract: stream elements so only the node lookup and
+            # the highway ways are held in memory, not every element
+            elements = stream_json_items(raw_file, 'elements.item')
+        else:
+            elements = load_json(raw_file).get('elements', [])
+
+        # Single pass over elements: build the node lookup for geometry
+        # construction and set aside highway ways. Overpass output order is
+        # not guaranteed, so ways are resolved once all nodes are known.
+        nodes = NodeIndex()
+        add_node = nodes.add
+        ways = []
+        add_way = ways.append
         for el in elements:
-            if el.get('type') == 'node':
-                nodes[el['id']] = (el['lon'], el['lat'])
+            el_type = el.get('type')
+            if el_type == 'node':
+                add_node(el['id'], el['lon'], el['lat'])
+            elif el_type == 'way':
+                tags = el.get('tags')
+                if tags and 'highway' in tags:
+                    add_way(el)
+        nodes.freeze()
 
         # Process ways (roads)
         features = []
-        for el in elements:
-            if el.get('type') != 'way':
-                continue
-
-            tags = el.get('tags', {})
-            if 'highway' not in tags:
-                continue
+        # Bind per-feature lookups once outside the loop
+        create_feature = self.create_normalized_road_feature
+        append_feature = features.append
+        for el in ways:
+            tags = el['tags']
 
             # Build geometry from node refs (LineString for roads)
-            node_refs = el.get('nodes', [])
-            coords = []
-            for ref in node_refs:
-                if ref in nodes:
-                    coords.append(list(nodes[ref]))
+            node_refs = el.get('nodes')
+            if not node_refs or len(node_refs) < 2:  # Too few refs for a line
+                continue
+            coords = nodes.resolve(node_refs)
 
             if len(coords) < 2:  # Need at least 2 points for a line
                 continue
@@ -106,9 +114,10 @@ class Normalizer(BaseRoadNormalizer):
             start_date = None
             has_explicit_date = False
 
-            for date_key in ['start_date', 'construction_date', 'nvdb:date', 'opening_date']:
-                if date_key in tags:
-                    start_date = parse_date(tags[date_key])
+            for date_key in DATE_KEYS:
+                value = tags.get(date_key)
+                if value is not None:
+                    start_date = parse_date(value)
                     if start_date:
                         has_explicit_date = True
                         break
@@ -134,7 +143,7 @@ class Normalizer(BaseRoadNormalizer):
                 road_name = tags.get('ref')
 
             # Create normalized feature
-            feature = self.create_normalized_road_feature(
+            feature = create_feature(
                 src_id=f"way/{el['id']}",
                 geometry=geometry,
                 sd=start_date,
@@ -145,14 +154,11 @@ class Normalizer(BaseRoadNormalizer):
                 raw_props={
                     'osm_id': el['id'],
                     'highway': highway,
-                    'tags': {k: v for k, v in tags.items() if k in [
-                        'name', 'ref', 'highway', 'surface', 'lanes',
-                        'maxspeed', 'oneway', 'bridge', 'tunnel'
-                    ]}
+                    'tags': {k: tags[k] for k in ROAD_TAG_KEEP if k in tags}
                 }
             )
 
-            features.append(feature)
+            append_feature(feature)
 
         return features
 
@@ -7,11 +7,11 @@ SEFRAK contains pre-1900 buildings with construction dates from the
 Norwegian cultural heritage registry (Riksantikvaren).
 """
 
-import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from .base import BaseNormalizer
+from .base import BaseNormalizer, load_json
 
 
 def parse_year(value) -> Optional[int]:
@@ -21,13 +21,18 @@ def parse_year(value) -> Optional[int]:
     if isinstance(value, int):
         return value
     if isinstance(value, str):
-        try:
-            return int(value.strip())
-        except ValueError:
-            return None
+        return _parse_year_str(value)
     return None
 
 
+@lru_cache(maxsize=1024)
+def _parse_year_str(value: str) -> Optional[int]:
+    try:
+        return int(value.strip())
+    except ValueError:
+        return None
+
+
 def determine_demolition_date(start: Optional[int], end: Optional[int], status: str) -> Optional[int]:
     """
     Determine if building was demolished based on status and dates.
@@ -52,6 +57,21 @@ def determine_demolition_date(start: Optional[int], end: Optional[int], status:
     return None
 
 
+# Function-name keywords per building category, checked in order
+FUNCTION_KEYWORDS = (
+    (('bolig', 'hus', 'bu', 'våningshus'), 'residential'),
+    (('fjøs', 'løe', 'stall', 'låve', 'naust'), 'agricultural'),
+    (('fabrikk', 'verksted', 'butikk', 'handel'), 'commercial'),  # Commercial/industrial
+    (('kirke', 'kapell', 'bedehus'), 'religious'),
+    (('ruin', 'rest', 'tomt'), 'ruin'),  # Ruin/remains
+)
+
+# SEFRAK bygningstype codes
+RESIDENTIAL_CODES = frozenset({'111', '112', '113', '171'})
+AGRICULTURAL_CODES = frozenset({'151', '152', '153', '161', '162'})
+
+
+@lru_cache(maxsize=1024)
 def map_building_type(bygningstype: Optional[str], function_name: Optional[str]) -> Optional[str]:
     """
     Map SEFRAK building type codes to simplified categories.
@@ -62,36 +82,24 @@ def map_building_type(bygningstype: Optional[str], function_name: Optional[str])
     - 182: Uthus (outbuilding)
     - 249: Ruin/rest
     - etc.
+
+    Cached: a registry dump uses only a few hundred distinct
+    type code / function name combinations.
     """
     if function_name:
         fn_lower = function_name.lower()
 
-        # Residential
-        if any(x in fn_lower for x in ['bolig', 'hus', 'bu', 'våningshus']):
-            return 'residential'
-
-        # Agricultural
-        if any(x in fn_lower for x in ['fjøs', 'løe', 'stall', 'låve', 'naust']):
-            return 'agricultural'
-
-        # Commercial/industrial
-        if any(x in fn_lower for x in ['fabrikk', 'verksted', 'butikk', 'handel']):
-            return 'commercial'
-
-        # Religious
-        if any(x in fn_lower for x in ['kirke', 'kapell', 'bedehus']):
-            return 'religious'
-
-        # Ruin/remains
-        if any(x in fn_lower for x in ['ruin', 'rest', 'tomt']):
-            return 'ruin'
+        for keywords, category in FUNCTION_KEYWORDS:
+            for keyword in keywords:
+                if keyword in fn_lower:
+                    return category
 
     # Fallback to bygningstype code if available
     if bygningstype:
         code = bygningstype.strip()
-        if code in ['111', '112', '113', '171']:
+        if code in RESIDENTIAL_CODES:
             return 'residential'
-        if code in ['151', '152', '153', '161', '162']:
+        if code in AGRICULTURAL_CODES:
             return 'agricultural'
         if code == '249':
             return 'ruin'
@@ -104,33 +112,45 @@ class Normalizer(BaseNormalizer):
 
     def __init__(self, **kwargs):
         super().__init__('sefrak', **kwargs)
+        self._transformer = None
 
-    def reproject_coordinates(self, coords: List[float]) -> List[float]:
+    def get_transformer(self):
         """
-        Reproject coordinates from EPSG:25832 (UTM 32N) to EPSG:4326 (WGS84).
+        Get the EPSG:25832 (UTM 32N) -> EPSG:4326 (WGS84) transformer.
 
         SEFRAK data uses UTM Zone 32N. We need to convert to lat/lon for web maps.
+        The transformer is built once per normalizer (construction is
+        expensive) and None is returned if pyproj is not installed.
         """
-        try:
-            from pyproj import Transformer
-
-            # Create transformer from UTM 32N to WGS84
-            transformer = Transformer.from_crs(
+        if self._transformer is None:
+            try:
+                from pyproj import Transformer
+            except ImportError:
+                return None
+            self._transformer = Transformer.from_crs(
                 "EPSG:25832",  # UTM Zone 32N
                 "EPSG:4326",   # WGS84 (lat/lon)
                 always_xy=True
             )
+        return self._transformer
 
-            # Transform (x, y) -> (lon, lat)
-            lon, lat = transformer.transform(coords[0], coords[1])
-            return [lon, lat]
+    def reproject_points(self, xs: List[float], ys: List[float]) -> Tuple[List[float], List[float]]:
+        """
+        Reproject points from EPSG:25832 to EPSG:4326 in one batch call.
 
-        except ImportError:
+        Returns:
+            (lons, lats) lists in input order
+        """
+        transformer = self.get_transformer()
+        if transformer is None:
             # If pyproj not available, warn and return original
             # (This will produce incorrect coordinates but allows testing)
             print("Warning: pyproj not installed. Coordinates will be incorrect.")
             print("Install with: pip install pyproj")
-            return coords
+            return xs, ys
+
+        # Transform (x, y) -> (lon, lat)
+        return transformer.transform(xs, ys)
 
     def normalize(self) -> List[Dict]:
         """Normalize SEFRAK buildings to common schema."""
@@ -155,12 +175,16 @@ class Normalizer(BaseNormalizer):
 
         print(f"  Reading from: {raw_file}")
 
-        with open(raw_file) as f:
-            data = json.load(f)
+        data = load_json(raw_file)
 
-        features = []
         skipped = {'no_geometry': 0, 'no_date': 0, 'no_id': 0}
 
+        # First pass: validate features and collect point coordinates, so
+        # they can be reprojected from UTM to WGS84 in a single batch
+        pending = []
+        xs = []
+        ys = []
+
         for feat in data.get('features', []):
             props = feat.get('properties', {})
             geom = feat.get('geometry')
@@ -190,23 +214,34 @@ class Normalizer(BaseNormalizer):
                 skipped['no_date'] += 1
                 continue
 
+            if geom['type'] != 'Point':
+                # Handle other geometry types if present
+                print(f"  Warning: Unsupported geometry type {geom['type']} for {sefrak_id}")
+                skipped['no_geometry'] += 1
+                continue
+
+            coords = geom['coordinates']
+            xs.append(coords[0])
+            ys.append(coords[1])
+            pending.append((props, sefrak_id, start, end, construction_year))
+
+        # Reproject geometry from UTM to WGS84
+        lons, lats = self.reproject_points(xs, ys) if pending else ([], [])
+
+        features = []
+        # Bind per-feature lookups once outside the loop
+        create_feature = self.create_normalized_feature
+        append_feature = features.append
+        for (props, sefrak_id, start, end, construction_year), lon, lat in zip(pending, lons, lats):
             # Determine if demolished
             status = str(props.get('sefrak_status', '1'))
             demolition_year = determine_demolition_date(start, end, status)
             demolished = (status == '0')  # Status 0 = demolished/gone
 
-            # Reproject geometry from UTM to WGS84
-            if geom['type'] == 'Point':
-                coords = self.reproject_coordinates(geom['coordinates'])
-                normalized_geom = {
-                    'type': 'Point',
-                    'coordinates': coords
-                }
-            else:
-                # Handle other geometry types if present
-                print(f"  Warning: Unsupported geometry type {geom['type']} for {sefrak_id}")
-                skipped['no_geometry'] += 1
-                continue
+            normalized_geom = {
+                'type': 'Point',
+                'coordinates': [lon, lat]
+            }
 
             # Map building type
             bt = map_building_type(
@@ -219,7 +254,7 @@ class Normalizer(BaseNormalizer):
 
             # Create normalized feature
             # SEFRAK is HIGH evidence - it's an official cultural heritage registry
-            feature = self.create_normalized_feature(
+            feature = create_feature(
                 src_id=sefrak_id,
                 geometry=normalized_geom,
                 sd=construction_year,
@@ -243,7 +278,7 @@ class Normalizer(BaseNormalizer):
             if demolished:
                 feature['properties']['demolished'] = True
 
-            features.append(feature)
+            append_feature(feature)
 
         # Report skipped features
         if any(skipped.values()):
@@ -10,18 +10,21 @@ Output: data/sources/manual/normalized/water.geojson
 """
 
 import argparse
-import json
+import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from .base import BaseNormalizer
+from .base import BaseNormalizer, load_json, write_feature_collection
+
+logger = logging.getLogger(__name__)
 
 
 # Valid water types
-WATER_TYPES = {'river', 'fjord', 'lake', 'canal', 'harbor'}
+WATER_TYPES = frozenset({'river', 'fjord', 'lake', 'canal', 'harbor'})
+VALID_WATER_TYPES_TEXT = ', '.join(sorted(WATER_TYPES))
 
 # Valid evidence levels
-EVIDENCE_LEVELS = {'h', 'm', 'l'}
+EVIDENCE_LEVELS = frozenset({'h', 'm', 'l'})
 
 # Valid year range
 MIN_YEAR = 1700
@@ -91,24 +94,26 @@ class WaterNormalizer(BaseNormalizer):
         """
         props = feat.get('properties', {})
         geometry = feat.get('geometry')
+        src_id = props.get('id')
+        feat_id = src_id or 'unknown'  # For log messages
 
         # Validate geometry
         if not geometry:
             self.stats['errors']['no_geometry'] += 1
-            print(f"  Warning: Skipping feature without geometry: {props.get('id', 'unknown')}")
+            logger.warning("Skipping feature without geometry: %s", feat_id)
             return None
 
         # Validate sd (required)
         sd_raw = props.get('sd')
         if sd_raw is None:
             self.stats['errors']['missing_sd'] += 1
-            print(f"  Warning: Skipping feature without sd: {props.get('id', 'unknown')}")
+            logger.warning("Skipping feature without sd: %s", feat_id)
             return None
 
         sd = self.validate_year(sd_raw, allow_none=False)
         if sd is False:
             self.stats['errors']['invalid_sd'] += 1
-            print(f"  Warning: Skipping feature with invalid sd '{sd_raw}': {props.get('id', 'unknown')}")
+            logger.warning("Skipping feature with invalid sd '%s': %s", sd_raw, feat_id)
             return None
 
         # Validate ed (optional, but must be valid if present)
@@ -118,39 +123,40 @@ class WaterNormalizer(BaseNormalizer):
             ed = self.validate_year(ed_raw, allow_none=True)
             if ed is False:
                 self.stats['errors']['invalid_ed'] += 1
-                print(f"  Warning: Skipping feature with invalid ed '{ed_raw}': {props.get('id', 'unknown')}")
+                logger.warning("Skipping feature with invalid ed '%s': %s", ed_raw, feat_id)
                 return None
             # Ensure ed > sd if both present
             if ed is not None and ed <= sd:
                 self.stats['errors']['invalid_ed'] += 1
-                print(f"  Warning: Skipping feature where ed ({ed}) <= sd ({sd}): {props.get('id', 'unknown')}")
+                logger.warning("Skipping feature where ed (%s) <= sd (%s): %s", ed, sd, feat_id)
                 return None
 
         # Validate wtype (required)
         wtype = props.get('wtype')
         if not wtype:
             self.stats['errors']['missing_wtype'] += 1
-            print(f"  Warning: Skipping feature without wtype: {props.get('id', 'unknown')}")
+            logger.warning("Skipping feature without wtype: %s", feat_id)
             return None
 
-        wtype = wtype.lower().strip()
+        # Most entries are already lowercase; only clean up the rest
+        if wtype not in WATER_TYPES:
+            wtype = wtype.lower().strip()
         if wtype not in WATER_TYPES:
             self.stats['errors']['invalid_wtype'] += 1
-            print(f"  Warning: Skipping feature with invalid wtype '{wtype}': {props.get('id', 'unknown')}")
-            print(f"           Valid types: {', '.join(sorted(WATER_TYPES))}")
+            logger.warning("Skipping feature with invalid wtype '%s': %s (valid types: %s)",
+                           wtype, feat_id, VALID_WATER_TYPES_TEXT)
             return None
 
         # Validate ev (optional, default 'm')
         ev = props.get('ev', 'm')
-        if isinstance(ev, str):
+        if isinstance(ev, str) and ev not in EVIDENCE_LEVELS:
             ev = ev.lower().strip()
         if ev not in EVIDENCE_LEVELS:
             self.stats['errors']['invalid_ev'] += 1
-            print(f"  Warning: Invalid evidence level '{ev}', using 'm': {props.get('id', 'unknown')}")
+            logger.warning("Invalid evidence level '%s', using 'm': %s", ev, feat_id)
             ev = 'm'
 
         # Generate ID if missing
-        src_id = props.get('id')
         if not src_id:
             src_id = f"water_{self.stats['valid']:04d}"
 
@@ -197,26 +203,24 @@ class WaterNormalizer(BaseNormalizer):
 
         return normalized
 
-    def normalize(self) -> List[Dict]:
+    def normalize_stream(self) -> Iterator[Dict]:
         """
-        Normalize water features to common schema.
+        Normalize water features to common schema, one at a time.
 
-        Returns:
-            List of normalized GeoJSON features
+        Yields:
+            Normalized GeoJSON features
         """
         # Determine input path
         raw_path = self.raw_dir / self.input_file
         if not raw_path.exists():
             print(f"  No raw data found at {raw_path}")
-            return []
+            return
 
         print(f"  Reading from: {raw_path}")
 
         # Load raw data
-        with open(raw_path) as f:
-            raw_data = json.load(f)
+        raw_data = load_json(raw_path)
 
-        features = []
         raw_features = raw_data.get('features', [])
         self.stats['total'] = len(raw_features)
 
@@ -224,28 +228,28 @@ class WaterNormalizer(BaseNormalizer):
         for feat in raw_features:
             normalized = self.normalize_feature(feat)
             if normalized:
-                features.append(normalized)
                 self.stats['valid'] += 1
+                yield normalized
             else:
                 self.stats['skipped'] += 1
 
-        return features
+    def normalize(self) -> List[Dict]:
+        """
+        Normalize water features to common schema.
+
+        Returns:
+            List of normalized GeoJSON features
+        """
+        return list(self.normalize_stream())
 
     def run(self) -> bool:
         """Run normalization and save output."""
         print(f"Normalizing water features from {self.source_id}...")
 
         try:
-            features = self.normalize()
-
-            # Save output
+            # Save output, serializing features as they are normalized
             output_path = self.normalized_dir / self.output_file
-            output = {
-                'type': 'FeatureCollection',
-                'features': features
-            }
-            with open(output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            count = write_feature_collection(output_path, self.normalize_stream())
 
             # Print statistics
             print(f"\n  Statistics:")
@@ -255,17 +259,19 @@ class WaterNormalizer(BaseNormalizer):
 
             if self.stats['skipped'] > 0:
                 print(f"\n  Errors by type:")
-                for error_type, count in sorted(self.stats['errors'].items()):
-                    if count > 0:
-                        print(f"    {error_type:20s}: {count}")
+                for error_type, n in sorted(self.stats['errors'].items()):
+                    if n > 0:
+                        print(f"    {error_type:20s}: {n}")
+                if not logger.isEnabledFor(logging.WARNING):
+                    print(f"    (run with --verbose for per-feature warnings)")
 
-            print(f"\n  Success: {len(features)} features normalized")
+            print(f"\n  Success: {count} features normalized")
             print(f"  Output: {output_path}")
 
             # Update manifest (if it exists)
             try:
                 manifest = self.load_manifest()
-                manifest['water_normalized_count'] = len(features)
+                manifest['water_normalized_count'] = count
                 self.save_manifest(manifest)
             except Exception as e:
                 print(f"  Warning: Could not update manifest: {e}")
@@ -310,8 +316,14 @@ Examples:
     parser.add_argument('--output', '-o', type=str,
                         default='water.geojson',
                         help='Output filename in data/sources/manual/normalized/ (default: water.geojson)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Log a warning for every skipped or corrected feature')
     args = parser.parse_args()
 
+    # Per-feature warnings are off by default; the summary reports counts
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR,
+                        format='  %(levelname)s: %(message)s')
+
     normalizer = WaterNormalizer(
         data_dir=args.data_dir,
         input_file=args.input,
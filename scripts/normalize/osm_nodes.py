@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Node coordinate lookup shared by the OSM normalizers.
+
+Overpass extracts reference way vertices by node id. Holding the nodes as
+a dict of (lon, lat) tuples costs roughly 200 bytes per node, which adds
+up to hundreds of MB on a full-city extract. NodeIndex instead stores
+ids, longitudes and latitudes as three flat arrays (24 bytes per node),
+sorted by id and searched with numpy.searchsorted. With numba installed
+the per-way lookup runs as a compiled kernel; without numpy it falls
+back to the plain dict.
+"""
+
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _resolve_refs(ids, lons, lats, refs):
+    """Gather [lon, lat] rows for refs found in the sorted ids array."""
+    out = np.empty((len(refs), 2), dtype=np.float64)
+    n = 0
+    for i in range(len(refs)):
+        ref = refs[i]
+        j = np.searchsorted(ids, ref, side='right') - 1
+        if j >= 0 and ids[j] == ref:
+            out[n, 0] = lons[j]
+            out[n, 1] = lats[j]
+            n += 1
+    return out[:n]
+
+
+if njit is not None and np is not None:
+    # Compiled once and cached on disk, so only the first run pays for it
+    _resolve_refs = njit(cache=True)(_resolve_refs)
+else:
+    _resolve_refs = None
+
+
+class NodeIndex:
+    """Node id -> (lon, lat) lookup for assembling way geometries."""
+
+    def __init__(self):
+        self._pending_ids = array('q')
+        self._pending_lons = array('d')
+        self._pending_lats = array('d')
+        self._ids = None
+        self._lons = None
+        self._lats = None
+        self._dict: Dict[int, Tuple[float, float]] = {}
+
+    def add(self, node_id: int, lon: float, lat: float) -> None:
+        """Record a node. Call freeze() once all nodes have been added."""
+        if np is None:
+            self._dict[node_id] = (lon, lat)
+            return
+        self._pending_ids.append(node_id)
+        self._pending_lons.append(lon)
+        self._pending_lats.append(lat)
+
+    def freeze(self) -> None:
+        """Sort the collected nodes by id so they can be looked up."""
+        if np is None:
+            return
+        ids = np.frombuffer(self._pending_ids, dtype=np.int64)
+        order = np.argsort(ids, kind='stable')
+        self._ids = ids[order]
+        self._lons = np.frombuffer(self._pending_lons, dtype=np.float64)[order]
+        self._lats = np.frombuffer(self._pending_lats, dtype=np.float64)[order]
+        self._pending_ids = array('q')
+        self._pending_lons = array('d')
+        self._pending_lats = array('d')
+
+    def resolve(self, node_refs: Sequence[int]) -> List[List[float]]:
+        """
+        Look up the coordinates of a way's node refs.
+
+        Refs missing from the extract are dropped, as are their positions
+        in the returned list.
+
+        Returns:
+            List of [lon, lat] pairs in ref order
+        """
+        if np is None:
+            nodes = self._dict
+            return [list(nodes[ref]) for ref in node_refs if ref in nodes]
+
+        ids = self._ids
+        if not len(node_refs) or not len(ids):
+            return []
+        refs = np.asarray(node_refs, dtype=np.int64)
+        if _resolve_refs is not None:
+            return _resolve_refs(ids, self._lons, self._lats, refs).tolist()
+
+        # Rightmost match, so a node repeated in the extract resolves to its
+        # last occurrence (same as overwriting a dict entry)
+        idx = np.searchsorted(ids, refs, side='right') - 1
+        np.maximum(idx, 0, out=idx)
+        idx = idx[ids[idx] == refs]
+        return np.column_stack((self._lons[idx], self._lats[idx])).tolist()
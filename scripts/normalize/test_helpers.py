@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared normalization helpers.
+
+Covers NodeIndex (osm_nodes.py), write_feature_collection and iter_chunks
+(base.py) and BaseRoadNormalizer.calculate_lengths (base_road.py),
+running each of their optional-dependency code paths that can run on
+this machine.
+
+Usage:
+    python scripts/normalize/test_helpers.py
+"""
+
+import json
+import math
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from normalize import base, base_road, osm_nodes
+from normalize.base import iter_chunks, write_feature_collection
+from normalize.base_road import BaseRoadNormalizer
+from normalize.osm_nodes import NodeIndex
+
+
+@contextmanager
+def patched(module, name, value):
+    """Temporarily replace a module attribute (to force a fallback path)."""
+    original = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+
+def node_index_paths():
+    """(label, attribute overrides) for each NodeIndex code path available."""
+    paths = []
+    if osm_nodes._resolve_refs is not None:
+        paths.append(('numba', {}))
+    if osm_nodes.np is not None:
+        paths.append(('numpy', {'_resolve_refs': None}))
+    paths.append(('dict', {'np': None, '_resolve_refs': None}))
+    return paths
+
+
+def build_index(nodes):
+    """NodeIndex holding (node_id, lon, lat) tuples, frozen."""
+    index = NodeIndex()
+    for node_id, lon, lat in nodes:
+        index.add(node_id, lon, lat)
+    index.freeze()
+    return index
+
+
+def test_node_index():
+    """Test NodeIndex lookups on every code path."""
+    print("Testing NodeIndex...")
+
+    nodes = [
+        (30, 10.3, 63.3),
+        (10, 10.1, 63.1),
+        (20, 10.2, 63.2),
+        (10, 11.1, 64.1),  # duplicate id: last occurrence wins
+    ]
+
+    for label, overrides in node_index_paths():
+        with patched(osm_nodes, 'np', overrides.get('np', osm_nodes.np)), \
+                patched(osm_nodes, '_resolve_refs',
+                        overrides.get('_resolve_refs', osm_nodes._resolve_refs)):
+            index = build_index(nodes)
+
+            # Ref order is kept, duplicates resolve to the last node added
+            assert index.resolve([20, 10, 30]) == [[10.2, 63.2], [11.1, 64.1], [10.3, 63.3]]
+
+            # Missing refs are dropped, along with their positions
+            assert index.resolve([5, 20, 25, 99]) == [[10.2, 63.2]]
+            assert index.resolve([99]) == []
+
+            # Empty input
+            assert index.resolve([]) == []
+            assert build_index([]).resolve([10, 20]) == []
+
+        print(f"  ✓ {label} path")
+
+    print("  All NodeIndex tests passed!\n")
+
+
+def test_write_feature_collection():
+    """Test streaming FeatureCollection output."""
+    print("Testing write_feature_collection()...")
+
+    features = [
+        {'type': 'Feature', 'properties': {'nm': 'Bryggen', 'sd': 1750},
+         'geometry': {'type': 'Point', 'coordinates': [10.4, 63.43]}},
+        {'type': 'Feature', 'properties': {'nm': 'Stiftsgården'},
+         'geometry': {'type': 'Point', 'coordinates': [10.39, 63.43]}},
+    ]
+
+    json_paths = [('orjson', base.orjson)] if base.orjson is not None else []
+    json_paths.append(('json', None))
+
+    for label, orjson in json_paths:
+        with patched(base, 'orjson', orjson), tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'out.geojson'
+
+            # Round trip from a generator, with and without a name
+            count = write_feature_collection(path, (f for f in features), name='test')
+            assert count == 2
+            with open(path) as f:
+                data = json.load(f)
+            assert data == {'type': 'FeatureCollection', 'name': 'test', 'features': features}
+
+            assert write_feature_collection(path, features) == 2
+            with open(path) as f:
+                assert 'name' not in json.load(f)
+
+            # No features is still a valid collection
+            assert write_feature_collection(path, []) == 0
+            with open(path) as f:
+                assert json.load(f) == {'type': 'FeatureCollection', 'features': []}
+
+            # A failing generator leaves the previous output and no temp file
+            def failing():
+                yield features[0]
+                raise ValueError('bad feature')
+
+            try:
+                write_feature_collection(path, failing())
+            except ValueError:
+                pass
+            else:
+                raise AssertionError('expected ValueError')
+            assert sorted(p.name for p in Path(tmpdir).iterdir()) == ['out.geojson']
+            with open(path) as f:
+                assert json.load(f)['features'] == []
+
+        print(f"  ✓ {label} path")
+
+    print("  All write_feature_collection tests passed!\n")
+
+
+def test_iter_chunks():
+    """Test splitting feature streams into worker chunks."""
+    print("Testing iter_chunks()...")
+
+    assert list(iter_chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(iter_chunks(range(6), 3)) == [[0, 1, 2], [3, 4, 5]]
+    assert list(iter_chunks((i for i in range(2)), 10)) == [[0, 1]]
+    assert list(iter_chunks([], 3)) == []
+    print("  ✓ Chunks keep order, last chunk may be short")
+
+    print("  All iter_chunks tests passed!\n")
+
+
+class _RoadNormalizer(BaseRoadNormalizer):
+    """Minimal concrete road normalizer for calling the shared helpers."""
+
+    def normalize(self):
+        return []
+
+
+def test_calculate_lengths():
+    """Test batched road lengths against the per-geometry calculation."""
+    print("Testing calculate_lengths()...")
+
+    geometries = [
+        {'type': 'LineString', 'coordinates': [[10.39, 63.43], [10.40, 63.43], [10.40, 63.44]]},
+        {'type': 'MultiLineString', 'coordinates': [
+            [[10.39, 63.43], [10.40, 63.43]],
+            [[10.41, 63.42], [10.41, 63.43], [10.42, 63.43]],
+        ]},
+        {'type': 'LineString', 'coordinates': [[10.39, 63.43, 5.0], [10.40, 63.43, 7.0]]},
+        {'type': 'LineString', 'coordinates': [[10.39, 63.43]]},  # single vertex
+        {'type': 'MultiLineString', 'coordinates': []},
+        {'type': 'Point', 'coordinates': [10.39, 63.43]},
+        {'type': 'LineString', 'coordinates': []},
+    ]
+    # Mixed 2D/3D vertices take the per-geometry fallback
+    ragged = geometries + [
+        {'type': 'LineString', 'coordinates': [[10.39, 63.43], [10.40, 63.44, 3.0]]},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        normalizer = _RoadNormalizer('test_roads', data_dir=Path(tmpdir))
+
+        numpy_paths = [('numpy', base_road.np)] if base_road.np is not None else []
+        numpy_paths.append(('pure Python', None))
+
+        for label, np in numpy_paths:
+            with patched(base_road, 'np', np):
+                for geoms in (geometries, ragged):
+                    expected = [normalizer.calculate_length(g) for g in geoms]
+                    lengths = normalizer.calculate_lengths(geoms)
+                    assert len(lengths) == len(geoms)
+                    for got, want in zip(lengths, expected):
+                        if want is None:
+                            assert got is None
+                        else:
+                            assert math.isclose(got, want, rel_tol=1e-9, abs_tol=1e-6), (got, want)
+
+                # ~500 m east-west plus ~1113 m north-south at 63.43°N
+                assert 1600 < normalizer.calculate_lengths(geometries[:1])[0] < 1620
+                assert normalizer.calculate_lengths([]) == []
+
+            print(f"  ✓ {label} path")
+
+    print("  All calculate_lengths tests passed!\n")
+
+
+def main():
+    print("=" * 60)
+    print("NORMALIZATION HELPER TESTS")
+    print("=" * 60 + "\n")
+
+    test_node_index()
+    test_write_feature_collection()
+    test_iter_chunks()
+    test_calculate_lengths()
+
+    print("All tests passed!")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,10 +4,37 @@ Normalize all date fields in GeoJSON to integers.
 Also implements the unified schema with proper date types.
 """
 
-import json
+import argparse
 import re
+import sys
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from normalize.base import (
+    ijson, iter_chunks, load_json, should_stream, stream_json_items,
+    write_feature_collection, write_ndjson,
+)
+from normalize.date_utils import parse_year_range
+
+# Date patterns, compiled once
+_RE_CENTURY = re.compile(r'^(\d{1,2})(?:st|nd|rd|th)\s+century', re.I)  # "19th century"
+
+def read_collection_name(path: Path, default: str) -> str:
+    """
+    Read the top-level "name" of a FeatureCollection without parsing its
+    features. Only looks before the features array, where GDAL and most
+    writers put it.
+    """
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == 'name' and event == 'string':
+                return value
+            if prefix == 'features':
+                break
+    return default
 
 def parse_date(value: Any) -> Optional[int]:
     """Parse a date value to an integer year."""
@@ -20,32 +47,55 @@ def parse_date(value: Any) -> Optional[int]:
     if isinstance(value, str):
         # Handle various string formats
         value = value.strip()
-        # Pure year: "1880"
-        if re.match(r'^\d{4}$', value):
-            return int(value)
-        # Date: "1880-01-01"
-        match = re.match(r'^(\d{4})', value)
-        if match:
-            return int(match.group(1))
-        # Range: "1880-1890" -> use start
-        match = re.match(r'^(\d{4})\s*[-–]\s*(\d{4})$', value)
-        if match:
-            return int(match.group(1))
-        # Decade: "1880s" -> 1880
-        match = re.match(r'^(\d{3})0s$', value)
-        if match:
-            return int(match.group(1)) * 10
+        # Year, date, range or decade ("1880", "1880-01-01", "1880-1890",
+        # "1880s"): the year is the first four digits, no regex needed
+        head = value[:4]
+        if len(head) == 4 and head.isdecimal():
+            return int(head)
         # Century: "19th century" -> 1800
-        match = re.match(r'^(\d{1,2})(?:st|nd|rd|th)\s+century', value, re.I)
+        match = _RE_CENTURY.match(value)
         if match:
             return (int(match.group(1)) - 1) * 100
     return None
 
+# Date type for the common sources; others fall back to the rules below
+DATE_TYPES = {
+    'sefrak': 'x',               # exact
+    'osm': 'x',
+    'matrikkelen': 'x',
+    'ml_1880_matched': 'n',      # not-later-than (strong evidence)
+    'ml_1880_not_detected': 'u',  # unknown (weak evidence, see below)
+    'osm_assumed': 'u',
+    'est': 'u',
+}
+
+# Short code per source name
+SOURCE_CODES = {
+    'sefrak': 'sef',
+    'osm': 'osm',
+    'osm_assumed': 'est',
+    'ml_1880_matched': 'ml80',
+    'ml_1880_not_detected': 'ml80',
+    'matrikkelen': 'mat',
+    'derived': 'der'
+}
+
+# Input properties replaced by the unified date fields (not copied as-is)
+DATE_KEYS = frozenset({
+    'start_date', 'end_date', 'source', 'confidence',
+    'ml_confidence', 'sefrak_period', 'start_date_min',
+    'existed_in', 'status',
+})
+
+# Sources come from a handful of names, so each is resolved once per
+# process (the per-feature equivalent of mapping a source column)
+@lru_cache(maxsize=256)
 def determine_date_type(source: str) -> str:
     """Determine date type code from source."""
-    if source in ('sefrak', 'osm', 'matrikkelen'):
-        return 'x'  # exact
-    elif source.startswith('ml_'):
+    date_type = DATE_TYPES.get(source)
+    if date_type is not None:
+        return date_type
+    if source.startswith('ml_'):
         if 'matched' in source:
             return 'n'  # not-later-than (strong evidence)
         elif 'not_detected' in source:
@@ -54,30 +104,19 @@ def determine_date_type(source: str) -> str:
             return 'u'  # unknown - should show at all times
     return 'u'  # unknown
 
+@lru_cache(maxsize=256)
 def source_code(source: str) -> str:
     """Convert source name to short code."""
-    mapping = {
-        'sefrak': 'sef',
-        'osm': 'osm',
-        'osm_assumed': 'est',
-        'ml_1880_matched': 'ml80',
-        'ml_1880_not_detected': 'ml80',
-        'matrikkelen': 'mat',
-        'derived': 'der'
-    }
-    return mapping.get(source, source[:3])
+    code = SOURCE_CODES.get(source)
+    return code if code is not None else sys.intern(source[:3])
 
 def normalize_feature(feature: Dict, is_demolished: bool = False) -> Dict:
     """Normalize a single feature's date properties."""
     props = feature.get('properties', {})
-    new_props = {}
-
     # Copy non-date properties
-    for key, value in props.items():
-        if key not in ('start_date', 'end_date', 'source', 'confidence',
-                       'ml_confidence', 'sefrak_period', 'start_date_min',
-                       'existed_in', 'status'):
-            new_props[key] = value
+    new_props: Dict[str, Any] = {
+        key: value for key, value in props.items() if key not in DATE_KEYS
+    }
 
     # Building ID
     if 'osm_id' in props:
@@ -103,7 +142,6 @@ def normalize_feature(feature: Dict, is_demolished: bool = False) -> Dict:
         }
 
     # Start date handling
-    start_date = parse_date(props.get('start_date'))
     source = props.get('source', 'est')
     date_type = determine_date_type(source)
 
@@ -113,36 +151,39 @@ def normalize_feature(feature: Dict, is_demolished: bool = False) -> Dict:
         # Frontend will treat missing sd as "always visible"
         new_props['sd_t'] = 'u'
         new_props['sd_s'] = source_code(source)
-    elif start_date is not None:
-        new_props['sd'] = start_date
-        new_props['sd_t'] = date_type
-        new_props['sd_s'] = source_code(source)
+    else:
+        # Only dated sources need the start date parsed
+        start_date = parse_date(props.get('start_date'))
+        if start_date is not None:
+            new_props['sd'] = start_date
+            new_props['sd_t'] = date_type
+            new_props['sd_s'] = source_code(source)
 
-        # Add confidence if not exact
-        if new_props['sd_t'] not in ('x', 'u'):
-            conf = props.get('ml_confidence') or props.get('confidence') or 0.5
-            new_props['sd_c'] = round(float(conf), 2)
+            # Add confidence if not exact
+            if new_props['sd_t'] not in ('x', 'u'):
+                conf = props.get('ml_confidence') or props.get('confidence') or 0.5
+                new_props['sd_c'] = round(float(conf), 2)
 
     # Handle SEFRAK periods like "1830-1840"
     if 'sefrak_period' in props:
-        period = props['sefrak_period']
-        match = re.match(r'^(\d{4})\s*[-–]\s*(\d{4})$', period)
-        if match:
-            new_props['sd'] = int(match.group(1))
-            new_props['sd_max'] = int(match.group(2))
+        period = parse_year_range(props['sefrak_period'])
+        if period:
+            new_props['sd'], new_props['sd_max'] = period
             new_props['sd_t'] = 'x'
             new_props['sd_s'] = 'sef'
 
     # End date handling
-    end_date = parse_date(props.get('end_date'))
+    end_date = parse_date(props['end_date']) if 'end_date' in props else None
     if end_date is not None and end_date != 2025:
         new_props['ed'] = end_date
         new_props['ed_t'] = 's'  # Usually estimated for demolished
         new_props['ed_s'] = source_code(source)
 
-    # Building type
+    # Building type; a small vocabulary ('yes', 'house', ...) repeated on
+    # every feature, so share one string object per value
     if 'building' in props:
-        new_props['btype'] = props['building']
+        btype = props['building']
+        new_props['btype'] = sys.intern(btype) if type(btype) is str else btype
     if 'name' in props and props['name']:
         new_props['name'] = props['name']
 
@@ -152,65 +193,119 @@ def normalize_feature(feature: Dict, is_demolished: bool = False) -> Dict:
         'geometry': feature['geometry']
     }
 
-def normalize_geojson(input_path: Path, output_path: Path, is_demolished: bool = False):
-    """Normalize all features in a GeoJSON file."""
-    print(f"Processing {input_path}...")
+# Features per task when normalizing with worker processes
+CHUNK_SIZE = 10000
 
-    with open(input_path, 'r') as f:
-        data = json.load(f)
+def normalize_chunk(features: List[Dict], is_demolished: bool = False) -> Tuple[List[Dict], List[str]]:
+    """
+    Normalize a batch of features.
 
+    Returns:
+        (normalized features, error messages for features that failed)
+    """
     normalized_features = []
-    for feature in data.get('features', []):
+    errors = []
+    for feature in features:
         try:
-            normalized = normalize_feature(feature, is_demolished=is_demolished)
-            normalized_features.append(normalized)
+            normalized_features.append(normalize_feature(feature, is_demolished=is_demolished))
         except Exception as e:
-            print(f"  Warning: Failed to normalize feature: {e}")
-            continue
+            errors.append(str(e))
+    return normalized_features, errors
 
-    output_data = {
-        'type': 'FeatureCollection',
-        'name': data.get('name', 'Normalized Buildings'),
-        'features': normalized_features
-    }
+def normalize_geojson(input_path: Path, output_path: Path, is_demolished: bool = False,
+                      workers: int = 1, ndjson: bool = False) -> None:
+    """
+    Normalize all features in a GeoJSON file.
+
+    With workers > 1, features are normalized in chunks across a process
+    pool. Output order is preserved. With ndjson, the output is written as
+    newline-delimited GeoJSON (one Feature per line) instead of a
+    FeatureCollection.
+    """
+    print(f"Processing {input_path}...")
 
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f)
+    if should_stream(input_path):
+        # Large input: stream features instead of loading the whole collection
+        name = read_collection_name(input_path, 'Normalized Buildings')
+        input_features = stream_json_items(input_path, 'features.item')
+    else:
+        data = load_json(input_path)
+        name = data.get('name', 'Normalized Buildings')
+        input_features = data.get('features', [])
 
-    print(f"  Normalized {len(normalized_features)} features")
+    normalize = partial(normalize_chunk, is_demolished=is_demolished)
+    chunks = iter_chunks(input_features, CHUNK_SIZE)
+
+    failed = 0
+    first_error = None
+    date_types: Dict[str, int] = {}
+    sources: Dict[str, int] = {}
+
+    def normalized_features(results: Iterable[Tuple[List[Dict], List[str]]]) -> Iterator[Dict]:
+        """Yield normalized features, tallying stats as they pass."""
+        nonlocal failed, first_error
+        for normalized, errors in results:
+            if errors:
+                # Summarized after the loop; bad inputs tend to fail the same
+                # way thousands of times
+                failed += len(errors)
+                first_error = first_error or errors[0]
+            for feat in normalized:
+                props = feat['properties']
+                dt = props.get('sd_t', 'none')
+                src = props.get('sd_s', 'none')
+                date_types[dt] = date_types.get(dt, 0) + 1
+                sources[src] = sources.get(src, 0) + 1
+                yield feat
+
+    # Normalize, serialize and count in one pass; features are written as
+    # they are produced instead of being collected into one big list
+    with Pool(workers) if workers > 1 else nullcontext() as pool:
+        results = pool.imap(normalize, chunks) if pool else map(normalize, chunks)
+        if ndjson:
+            count = write_ndjson(output_path, normalized_features(results))
+        else:
+            count = write_feature_collection(output_path, normalized_features(results), name=name)
+
+    print(f"  Normalized {count} features")
+    if failed:
+        print(f"  Warning: Failed to normalize {failed} features (first: {first_error})")
     print(f"  Output: {output_path}")
 
     # Print stats
-    date_types = {}
-    sources = {}
-    for feat in normalized_features:
-        props = feat.get('properties', {})
-        dt = props.get('sd_t', 'none')
-        src = props.get('sd_s', 'none')
-        date_types[dt] = date_types.get(dt, 0) + 1
-        sources[src] = sources.get(src, 0) + 1
-
     print(f"\n  Date types: {date_types}")
     print(f"  Sources: {sources}")
 
-def main():
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Normalize building date fields to the unified schema')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for normalizing features (default: 1)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Write newline-delimited GeoJSON (.ndjson) output')
+    args = parser.parse_args()
+
     data_dir = Path(__file__).parent.parent / 'data'
+    suffix = '.ndjson' if args.ndjson else '.geojson'
 
     # Normalize dated buildings
     normalize_geojson(
         data_dir / 'buildings_dated.geojson',
-        data_dir / 'buildings_unified.geojson',
-        is_demolished=False
+        data_dir / f'buildings_unified{suffix}',
+        is_demolished=False,
+        workers=args.workers,
+        ndjson=args.ndjson
     )
 
     # Normalize demolished buildings
     normalize_geojson(
         data_dir / 'buildings_demolished_since_1880.geojson',
-        data_dir / 'buildings_demolished_unified.geojson',
-        is_demolished=True
+        data_dir / f'buildings_demolished_unified{suffix}',
+        is_demolished=True,
+        workers=args.workers,
+        ndjson=args.ndjson
     )
 
-    print("\nDone! Use buildings_unified.geojson for the frontend.")
+    print(f"\nDone! Use buildings_unified{suffix} for the frontend.")
 
 if __name__ == '__main__':
     main()
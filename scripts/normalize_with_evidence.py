@@ -16,10 +16,17 @@ Rules:
 - Demolished buildings: Need strong evidence (ML detection)
 """
 
-import json
-import re
+import argparse
+import sys
+from contextlib import nullcontext
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from normalize.base import (
+    iter_chunks, load_json, should_stream, stream_json_items, write_feature_collection,
+)
+from normalize.date_utils import parse_year_range
 
 def parse_date(value: Any) -> Optional[int]:
     """Parse a date value to an integer year."""
@@ -31,49 +38,50 @@ def parse_date(value: Any) -> Optional[int]:
         return int(value)
     if isinstance(value, str):
         value = value.strip()
-        if re.match(r'^\d{4}$', value):
-            return int(value)
-        match = re.match(r'^(\d{4})', value)
-        if match:
-            return int(match.group(1))
-        match = re.match(r'^(\d{4})\s*[-–]\s*(\d{4})$', value)
-        if match:
-            return int(match.group(1))
+        # Year, date or range ("1880", "1880-01-01", "1880-1890"):
+        # the year is the first four digits, no regex needed
+        head = value[:4]
+        if len(head) == 4 and head.isdecimal():
+            return int(head)
     return None
 
+# Sources that are strong evidence on their own
+STRONG_SOURCES = frozenset({
+    'sefrak', 'matrikkelen',  # Registry data is strong
+    'ml_1880_matched',        # ML detection is strong evidence of existence
+})
+
+# Short code per source name
+SOURCE_CODES = {
+    'sefrak': 'sef',
+    'osm': 'osm',
+    'osm_assumed': 'osm',
+    'ml_1880_matched': 'ml',
+    'ml_1880_not_detected': 'osm',
+    'matrikkelen': 'mat',
+}
+
 def determine_evidence_strength(source: str, has_date: bool) -> str:
     """
     Determine evidence strength.
     Returns: 'h' (high/strong), 'm' (medium), 'l' (low/weak)
     """
-    if source in ('sefrak', 'matrikkelen'):
-        return 'h'  # Registry data is strong
+    if source in STRONG_SOURCES:
+        return 'h'
     if source == 'osm' and has_date:
         return 'h'  # OSM with explicit date is strong
-    if source == 'ml_1880_matched':
-        return 'h'  # ML detection is strong evidence of existence
-    if source == 'osm':
-        return 'l'  # OSM without date - building exists but date unknown
-    if source in ('ml_1880_not_detected', 'osm_assumed', 'est'):
-        return 'l'  # No evidence
+    # OSM without date (building exists but date unknown), ML not
+    # detected, assumed/estimated: no evidence
     return 'l'
 
 def source_code(source: str) -> str:
     """Convert source name to short code."""
-    mapping = {
-        'sefrak': 'sef',
-        'osm': 'osm',
-        'osm_assumed': 'osm',
-        'ml_1880_matched': 'ml',
-        'ml_1880_not_detected': 'osm',
-        'matrikkelen': 'mat',
-    }
-    return mapping.get(source, 'unk')
+    return SOURCE_CODES.get(source, 'unk')
 
 def normalize_building(feature: Dict) -> Dict:
     """Normalize a single building feature."""
     props = feature.get('properties', {})
-    new_props = {}
+    new_props: Dict[str, Any] = {}
 
     # Building ID
     if 'osm_id' in props:
@@ -100,10 +108,9 @@ def normalize_building(feature: Dict) -> Dict:
 
     # Handle SEFRAK periods
     if 'sefrak_period' in props:
-        period = props['sefrak_period']
-        match = re.match(r'^(\d{4})\s*[-–]\s*(\d{4})$', period)
-        if match:
-            new_props['sd'] = int(match.group(1))
+        period = parse_year_range(props['sefrak_period'])
+        if period:
+            new_props['sd'] = period[0]
             new_props['ev'] = 'h'
             new_props['src'] = 'sef'
 
@@ -112,9 +119,11 @@ def normalize_building(feature: Dict) -> Dict:
         conf = props.get('ml_confidence', 0.8)
         new_props['mlc'] = round(float(conf), 2)
 
-    # Building metadata
+    # Building metadata; the type comes from a small vocabulary repeated on
+    # every feature, so share one string object per value
     if 'building' in props:
-        new_props['bt'] = props['building']
+        bt = props['building']
+        new_props['bt'] = sys.intern(bt) if type(bt) is str else bt
     if 'name' in props and props['name']:
         new_props['nm'] = props['name']
 
@@ -127,15 +136,13 @@ def normalize_building(feature: Dict) -> Dict:
 def normalize_demolished(feature: Dict) -> Dict:
     """Normalize a demolished building feature."""
     props = feature.get('properties', {})
-    new_props = {}
-
-    existed_in = props.get('existed_in', 1880)
-
-    new_props['sd'] = existed_in
-    new_props['ev'] = 'h'  # ML detection is strong evidence
-    new_props['src'] = 'ml'
-    new_props['dem'] = 1  # Flag as demolished
-    new_props['mlc'] = props.get('confidence', 0.7)
+    new_props = {
+        'sd': props.get('existed_in', 1880),
+        'ev': 'h',  # ML detection is strong evidence
+        'src': 'ml',
+        'dem': 1,  # Flag as demolished
+        'mlc': props.get('confidence', 0.7),
+    }
 
     return {
         'type': 'Feature',
@@ -143,68 +150,111 @@ def normalize_demolished(feature: Dict) -> Dict:
         'geometry': feature['geometry']
     }
 
-def process_file(input_path: Path, output_path: Path, is_demolished: bool = False):
-    """Process a GeoJSON file."""
-    print(f"Processing {input_path.name}...")
+# Features per task when processing with worker processes
+CHUNK_SIZE = 10000
 
-    with open(input_path, 'r') as f:
-        data = json.load(f)
+def normalize_buildings(features: List[Dict]) -> Tuple[List[Dict], List[str]]:
+    """Normalize a batch of building features; returns (features, errors)."""
+    normalized_features = []
+    errors = []
+    for feat in features:
+        try:
+            normalized_features.append(normalize_building(feat))
+        except Exception as e:
+            errors.append(str(e))
+    return normalized_features, errors
 
-    features = []
-    for feat in data.get('features', []):
+def normalize_demolished_buildings(features: List[Dict]) -> Tuple[List[Dict], List[str]]:
+    """Normalize a batch of demolished building features; returns (features, errors)."""
+    normalized_features = []
+    errors = []
+    for feat in features:
         try:
-            if is_demolished:
-                normalized = normalize_demolished(feat)
-            else:
-                normalized = normalize_building(feat)
-            features.append(normalized)
+            normalized_features.append(normalize_demolished(feat))
         except Exception as e:
-            print(f"  Warning: {e}")
-            continue
+            errors.append(str(e))
+    return normalized_features, errors
 
-    output_data = {
-        'type': 'FeatureCollection',
-        'features': features
-    }
+def process_file(input_path: Path, output_path: Path, is_demolished: bool = False,
+                 workers: int = 1) -> None:
+    """
+    Process a GeoJSON file.
+
+    With workers > 1, features are normalized in chunks across a process
+    pool. Output order is preserved.
+    """
+    print(f"Processing {input_path.name}...")
+
+    if should_stream(input_path):
+        # Large input: stream features instead of loading the whole collection
+        input_features = stream_json_items(input_path, 'features.item')
+    else:
+        input_features = load_json(input_path).get('features', [])
 
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f)
+    normalize = normalize_demolished_buildings if is_demolished else normalize_buildings
+    chunks = iter_chunks(input_features, CHUNK_SIZE)
 
-    # Stats
+    failed = 0
+    first_error = None
     ev_counts = {'h': 0, 'm': 0, 'l': 0}
-    src_counts = {}
+    src_counts: Dict[str, int] = {}
     has_sd = 0
 
-    for feat in features:
-        p = feat['properties']
-        ev = p.get('ev', 'l')
-        ev_counts[ev] = ev_counts.get(ev, 0) + 1
-        src = p.get('src', 'unk')
-        src_counts[src] = src_counts.get(src, 0) + 1
-        if 'sd' in p:
-            has_sd += 1
-
-    print(f"  Total: {len(features)}")
+    def normalized_features(results: Iterable[Tuple[List[Dict], List[str]]]) -> Iterator[Dict]:
+        """Yield normalized features, tallying stats as they pass."""
+        nonlocal failed, first_error, has_sd
+        for normalized, errors in results:
+            if errors:
+                # Summarized below; bad inputs tend to fail the same way
+                # thousands of times
+                failed += len(errors)
+                first_error = first_error or errors[0]
+            for feat in normalized:
+                p = feat['properties']
+                ev = p.get('ev', 'l')
+                ev_counts[ev] = ev_counts.get(ev, 0) + 1
+                src = p.get('src', 'unk')
+                src_counts[src] = src_counts.get(src, 0) + 1
+                if 'sd' in p:
+                    has_sd += 1
+                yield feat
+
+    # Normalize, serialize and count in one pass; features are written as
+    # they are produced instead of being collected into one big list
+    with Pool(workers) if workers > 1 else nullcontext() as pool:
+        results = pool.imap(normalize, chunks) if pool else map(normalize, chunks)
+        count = write_feature_collection(output_path, normalized_features(results))
+
+    print(f"  Total: {count}")
+    if failed:
+        print(f"  Warning: Failed to normalize {failed} features (first: {first_error})")
     print(f"  Evidence: {ev_counts}")
     print(f"  Sources: {src_counts}")
     print(f"  With start date: {has_sd}")
     print(f"  Output: {output_path}")
 
-def main():
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Normalize buildings with era-based evidence levels')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for normalizing features (default: 1)')
+    args = parser.parse_args()
+
     data_dir = Path(__file__).parent.parent / 'data'
 
     # Process main buildings
     process_file(
         data_dir / 'buildings_dated.geojson',
         data_dir / 'buildings_v2.geojson',
-        is_demolished=False
+        is_demolished=False,
+        workers=args.workers
     )
 
     # Process demolished buildings
     process_file(
         data_dir / 'buildings_demolished_since_1880.geojson',
         data_dir / 'buildings_demolished_v2.geojson',
-        is_demolished=True
+        is_demolished=True,
+        workers=args.workers
     )
 
     print("\nDone!")
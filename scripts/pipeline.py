@@ -10,15 +10,25 @@ Runs the full data pipeline:
 """
 
 import argparse
+import importlib
+import importlib.util
+import io
 import json
+import os
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from functools import lru_cache, partial
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 def run_stage(stage: str, sources: Optional[List[str]] = None,
               data_dir: Optional[Path] = None, pmtiles: bool = True,
-              feature_type: str = 'buildings') -> bool:
+              feature_type: str = 'buildings', workers: int = 1) -> bool:
     """
     Run a pipeline stage.
 
@@ -28,6 +38,7 @@ def run_stage(stage: str, sources: Optional[List[str]] = None,
         data_dir: Base data directory
         pmtiles: Generate PMTiles during export (default: True)
         feature_type: 'buildings', 'roads', or 'all'
+        workers: Worker processes for per-source ingest/normalize (default: 1)
 
     Returns:
         True if successful
@@ -41,14 +52,14 @@ def run_stage(stage: str, sources: Optional[List[str]] = None,
             print(f"\n{'#'*60}")
             print(f"FEATURE TYPE: {ft.upper()}")
             print('#'*60)
-            if not run_stage(stage, sources, data_dir, pmtiles, ft):
+            if not run_stage(stage, sources, data_dir, pmtiles, ft, workers):
                 success = False
         return success
 
     if stage == 'ingest':
-        return run_ingest(sources, data_dir, feature_type)
+        return run_ingest(sources, data_dir, feature_type, workers)
     elif stage == 'normalize':
-        return run_normalize(sources, data_dir, feature_type)
+        return run_normalize(sources, data_dir, feature_type, workers)
     elif stage == 'merge':
         return run_merge(data_dir, feature_type)
     elif stage == 'export':
@@ -59,7 +70,8 @@ def run_stage(stage: str, sources: Optional[List[str]] = None,
             print(f"\n{'='*60}")
             print(f"STAGE: {s.upper()}")
             print('='*60)
-            if not run_stage(s, sources, data_dir, pmtiles=pmtiles, feature_type=feature_type):
+            if not run_stage(s, sources, data_dir, pmtiles=pmtiles,
+                             feature_type=feature_type, workers=workers):
                 print(f"Stage {s} failed!")
                 success = False
                 # Continue anyway for now
@@ -69,30 +81,235 @@ def run_stage(stage: str, sources: Optional[List[str]] = None,
         return False
 
 
-def discover_sources(sources_dir: Path) -> dict:
+# Per-source data directories; these never contain nested sources
+SKIP_DIRS = frozenset(('raw', 'normalized'))
+
+
+# Parsed manifests from the last walk, reused while no manifest has changed
+DISCOVER_CACHE_NAME = '.discover_cache.json'
+
+
+def _find_manifests(sources_dir: str) -> Dict[str, int]:
     """
-    Recursively discover all sources by finding manifest.json files.
+    Find manifest.json files under sources_dir.
+
+    Uses os.scandir (dirent types, no Path objects) and does not descend
+    into raw/normalized data directories; only the manifests themselves
+    are stat'ed.
 
     Returns:
-        Dict mapping source_id -> source_path
+        Dict mapping manifest path -> modification time (ns)
     """
-    sources = {}
+    manifests = {}
+    stack = [sources_dir]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name == 'manifest.json':
+                    manifests[entry.path] = entry.stat().st_mtime_ns
+    return manifests
+
+
+@lru_cache(maxsize=1)
+def _scan_manifests(sources_dir: str) -> Dict[str, Tuple[Path, Dict]]:
+    """
+    Find and parse every manifest.json under sources_dir.
 
-    # Recursively find all manifest.json files
-    for manifest_path in sources_dir.rglob('manifest.json'):
+    The parsed manifests are cached in sources_dir/.discover_cache.json
+    together with each manifest's mtime, and reused as long as the same
+    set of manifests is found unchanged. Memoized so the stages of one
+    pipeline invocation share a single walk.
+
+    Returns:
+        Dict mapping source_id -> (source_path, manifest)
+    """
+    signature = _find_manifests(sources_dir)
+    cache_path = os.path.join(sources_dir, DISCOVER_CACHE_NAME)
+
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+        if cache.get('signature') == signature:
+            return {
+                source_id: (Path(source_path), manifest)
+                for source_id, (source_path, manifest) in cache['sources'].items()
+            }
+    except (OSError, ValueError, KeyError):
+        pass  # Missing or unreadable cache; rebuild it
+
+    sources = {}
+    for manifest_path in signature:
         with open(manifest_path) as f:
             manifest = json.load(f)
-
         source_id = manifest.get('source_id')
         if source_id:
             # Source directory is the parent of manifest.json
-            source_path = manifest_path.parent
-            sources[source_id] = source_path
+            sources[source_id] = (Path(manifest_path).parent, manifest)
+
+    try:
+        with open(cache_path, 'w') as f:
+            json.dump({
+                'signature': signature,
+                'sources': {
+                    source_id: [str(source_path), manifest]
+                    for source_id, (source_path, manifest) in sources.items()
+                },
+            }, f)
+    except OSError:
+        pass  # Read-only data directory; the cache is only an optimization
 
     return sources
 
 
-def run_ingest(sources: Optional[List[str]], data_dir: Path, feature_type: str = 'buildings') -> bool:
+def discover_sources(sources_dir: Path) -> dict:
+    """
+    Recursively discover all sources by finding manifest.json files.
+
+    Returns:
+        Dict mapping source_id -> source_path
+    """
+    return {
+        source_id: source_path
+        for source_id, (source_path, _) in _scan_manifests(str(sources_dir)).items()
+    }
+
+
+@lru_cache(maxsize=None)
+def load_stage_module(module_name: str) -> Optional[ModuleType]:
+    """
+    Import a source-specific ingest/normalize module.
+
+    Checks importlib.util.find_spec first, so sources without a module
+    (the common case for ML sources) do not go through a failed import.
+    Cached, so each module is looked up once per pipeline run.
+
+    Returns:
+        The module, or None if it does not exist or fails to import
+    """
+    try:
+        if importlib.util.find_spec(module_name) is None:
+            return None
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+
+def ingest_source(source_id: str, data_dir: Path) -> bool:
+    """Run the ingestor for a single source."""
+    print(f"\n--- {source_id} ---")
+
+    # Try to import and run source-specific ingestor
+    module_name = f"ingest.{source_id}"
+    module = load_stage_module(module_name)
+    if module is not None:
+        if hasattr(module, 'Ingestor'):
+            # A dependency the ingestor imports lazily fails this source only
+            try:
+                ingestor = module.Ingestor(data_dir=data_dir)
+                if not ingestor.run():
+                    return False
+            except ImportError as e:
+                print(f"  Ingestor for {source_id} failed: {e}")
+                return False
+        else:
+            print(f"  No Ingestor class found in {module_name}")
+    else:
+        print(f"  No ingestor module found for {source_id}")
+        if source_id.startswith('ml_'):
+            print(f"  For ML sources: Use scripts/ingest/ml_extract.py --source {source_id.replace('ml_', '')}")
+        else:
+            print(f"  Create: scripts/ingest/{source_id}.py")
+    return True
+
+
+def normalize_source(source_id: str, data_dir: Path, feature_type: str = 'buildings') -> bool:
+    """Run the normalizer for a single source."""
+    print(f"\n--- {source_id} ---")
+
+    # Determine which normalizer to use
+    if feature_type == 'roads':
+        # Use road-specific normalizers
+        normalizer_name = source_id
+        if source_id == 'osm_roads':
+            normalizer_name = 'osm_roads'
+        elif source_id.startswith('ml_'):
+            normalizer_name = 'ml_roads'
+    else:
+        normalizer_name = source_id
+
+    # Try to import and run source-specific normalizer
+    module_name = f"normalize.normalize_{normalizer_name}"
+    module = load_stage_module(module_name)
+    if module is not None:
+        if hasattr(module, 'Normalizer'):
+            # A dependency the normalizer imports lazily fails this source only
+            try:
+                normalizer = module.Normalizer(data_dir=data_dir)
+                if not normalizer.run():
+                    return False
+            except ImportError as e:
+                print(f"  Normalizer for {source_id} failed: {e}")
+                return False
+        else:
+            print(f"  No Normalizer class found in {module_name}")
+    else:
+        print(f"  No normalizer module found for {normalizer_name}")
+        if source_id.startswith('ml_'):
+            if feature_type == 'roads':
+                print(f"  For ML road sources: Use scripts/normalize/normalize_ml_roads.py --source {source_id.replace('ml_', '')}")
+            else:
+                print(f"  For ML sources: Use scripts/normalize/normalize_ml.py --source {source_id.replace('ml_', '')}")
+        else:
+            print(f"  Create: scripts/normalize/normalize_{normalizer_name}.py")
+    return True
+
+
+def _run_captured(func: Callable[..., bool], source_id: str, data_dir: Path) -> Tuple[bool, str]:
+    """Run a per-source step, returning its result and everything it printed."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        try:
+            result = func(source_id, data_dir)
+        except Exception:
+            traceback.print_exc()
+            result = False
+    return result, buffer.getvalue()
+
+
+def run_per_source(func: Callable[..., bool], source_ids: List[str], data_dir: Path,
+                   workers: int = 1) -> bool:
+    """
+    Run a per-source step (ingest or normalize) for each source.
+
+    Sources are independent, so with workers > 1 they run in parallel
+    worker processes. Each source's output is buffered and printed in
+    source order once it finishes, so logs do not interleave.
+
+    Returns:
+        True if the step succeeded for every source
+    """
+    if workers <= 1 or len(source_ids) <= 1:
+        return all([func(source_id, data_dir) for source_id in source_ids])
+
+    success = True
+    with ProcessPoolExecutor(max_workers=min(workers, len(source_ids))) as executor:
+        for result, output in executor.map(
+            _run_captured, repeat(func), source_ids, repeat(data_dir)
+        ):
+            print(output, end='')
+            success = success and result
+    return success
+
+
+def run_ingest(sources: Optional[List[str]], data_dir: Path, feature_type: str = 'buildings',
+               workers: int = 1) -> bool:
     """Run ingestion for specified sources."""
     print(f"\nRunning ingestion for {feature_type}...")
 
@@ -113,31 +330,16 @@ def run_ingest(sources: Optional[List[str]], data_dir: Path, feature_type: str =
         else:
             source_ids = list(all_sources.keys())
 
-    success = True
-    for source_id in source_ids:
-        print(f"\n--- {source_id} ---")
+    success = run_per_source(ingest_source, source_ids, data_dir, workers=workers)
 
-        # Try to import and run source-specific ingestor
-        try:
-            module_name = f"ingest.{source_id}"
-            module = __import__(module_name, fromlist=[''])
-            if hasattr(module, 'Ingestor'):
-                ingestor = module.Ingestor(data_dir=data_dir)
-                if not ingestor.run():
-                    success = False
-            else:
-                print(f"  No Ingestor class found in {module_name}")
-        except ImportError:
-            print(f"  No ingestor module found for {source_id}")
-            if source_id.startswith('ml_'):
-                print(f"  For ML sources: Use scripts/ingest/ml_extract.py --source {source_id.replace('ml_', '')}")
-            else:
-                print(f"  Create: scripts/ingest/{source_id}.py")
+    # Ingestors create and update manifests, so later stages must re-scan
+    _scan_manifests.cache_clear()
 
     return success
 
 
-def run_normalize(sources: Optional[List[str]], data_dir: Path, feature_type: str = 'buildings') -> bool:
+def run_normalize(sources: Optional[List[str]], data_dir: Path, feature_type: str = 'buildings',
+                  workers: int = 1) -> bool:
     """Run normalization for specified sources."""
     print(f"\nRunning normalization for {feature_type}...")
 
@@ -155,42 +357,8 @@ def run_normalize(sources: Optional[List[str]], data_dir: Path, feature_type: st
         else:
             source_ids = list(all_sources.keys())
 
-    success = True
-    for source_id in source_ids:
-        print(f"\n--- {source_id} ---")
-
-        # Determine which normalizer to use
-        if feature_type == 'roads':
-            # Use road-specific normalizers
-            normalizer_name = source_id
-            if source_id == 'osm_roads':
-                normalizer_name = 'osm_roads'
-            elif source_id.startswith('ml_'):
-                normalizer_name = 'ml_roads'
-        else:
-            normalizer_name = source_id
-
-        # Try to import and run source-specific normalizer
-        try:
-            module_name = f"normalize.normalize_{normalizer_name}"
-            module = __import__(module_name, fromlist=[''])
-            if hasattr(module, 'Normalizer'):
-                normalizer = module.Normalizer(data_dir=data_dir)
-                if not normalizer.run():
-                    success = False
-            else:
-                print(f"  No Normalizer class found in {module_name}")
-        except ImportError:
-            print(f"  No normalizer module found for {normalizer_name}")
-            if source_id.startswith('ml_'):
-                if feature_type == 'roads':
-                    print(f"  For ML road sources: Use scripts/normalize/normalize_ml_roads.py --source {source_id.replace('ml_', '')}")
-                else:
-                    print(f"  For ML sources: Use scripts/normalize/normalize_ml.py --source {source_id.replace('ml_', '')}")
-            else:
-                print(f"  Create: scripts/normalize/normalize_{normalizer_name}.py")
-
-    return success
+    normalize = partial(normalize_source, feature_type=feature_type)
+    return run_per_source(normalize, source_ids, data_dir, workers=workers)
 
 
 def run_merge(data_dir: Path, feature_type: str = 'buildings') -> bool:
@@ -338,25 +506,21 @@ def run_export_buildings(data_dir: Path, pmtiles: bool = True) -> bool:
 def list_sources(data_dir: Path) -> None:
     """List all available sources and their status."""
     sources_dir = data_dir / 'sources'
-    all_sources = discover_sources(sources_dir)
+    all_sources = _scan_manifests(str(sources_dir))
 
     print("\nAvailable sources:")
     print("-" * 60)
 
     for source_id in sorted(all_sources.keys()):
-        source_path = all_sources[source_id]
-        manifest_path = source_path / 'manifest.json'
+        source_path, manifest = all_sources[source_id]
         raw_dir = source_path / 'raw'
         normalized_dir = source_path / 'normalized'
 
         status = []
-        if manifest_path.exists():
-            with open(manifest_path) as f:
-                manifest = json.load(f)
-            if manifest.get('ingested_at'):
-                status.append('ingested')
-            if manifest.get('normalized_at'):
-                status.append('normalized')
+        if manifest.get('ingested_at'):
+            status.append('ingested')
+        if manifest.get('normalized_at'):
+            status.append('normalized')
 
         has_raw = raw_dir.exists() and any(raw_dir.iterdir()) if raw_dir.exists() else False
         has_normalized = (normalized_dir / 'buildings.geojson').exists()
@@ -381,6 +545,7 @@ Examples:
   python pipeline.py --stage all --feature-type all    # Run for both buildings and roads
   python pipeline.py --stage ingest           # Run only ingestion
   python pipeline.py --stage normalize -s osm # Normalize only OSM
+  python pipeline.py --stage normalize -j 4   # Normalize 4 sources at a time
   python pipeline.py --stage export           # Export GeoJSON + PMTiles
   python pipeline.py --stage export --no-pmtiles  # Export GeoJSON only
   python pipeline.py --list                   # List sources and status
@@ -407,6 +572,8 @@ Road pipeline example:
                         help='Skip PMTiles generation during export')
     parser.add_argument('--list', '-l', action='store_true',
                         help='List available sources and exit')
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='Ingest/normalize this many sources in parallel (default: 1)')
 
     args = parser.parse_args()
 
@@ -416,7 +583,8 @@ Road pipeline example:
 
     success = run_stage(args.stage, args.sources, args.data_dir,
                         pmtiles=not args.no_pmtiles,
-                        feature_type=args.feature_type)
+                        feature_type=args.feature_type,
+                        workers=args.workers)
     sys.exit(0 if success else 1)
 
 
@@ -1,111 +1,282 @@
 #!/usr/bin/env python3
 """Re-match SEFRAK to existing OSM buildings with proper coordinate transform."""
 
-import json
-from math import sqrt
+import argparse
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
+from math import hypot, inf
 from pathlib import Path
+
+import numpy as np
 from pyproj import Transformer
 
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+from normalize.base import iter_geojson_features, load_json, write_json
+from normalize.date_utils import parse_year
+
 data_dir = Path(__file__).parent.parent / 'data'
 
-# Load SEFRAK
+# Temporal attribute columns written to the Parquet sidecar
+ATTRS_COLUMNS = ('start_date', 'end_date', 'source', 'sefrak_period')
+
+
+def _nearest_brute(px, py, qx, qy, max_distance):
+    """Brute-force nearest point within max_distance of each query."""
+    n = len(px)
+    dists = np.full(len(qx), np.inf)
+    idxs = np.full(len(qx), n, dtype=np.intp)
+    limit = max_distance * max_distance
+    for i in prange(len(qx)):
+        x = qx[i]
+        y = qy[i]
+        best = limit
+        best_idx = n
+        for j in range(n):
+            dx = px[j] - x
+            dy = py[j] - y
+            d2 = dx * dx + dy * dy
+            if d2 < best:
+                best = d2
+                best_idx = j
+        if best_idx < n:
+            dists[i] = np.sqrt(best)
+            idxs[i] = best_idx
+    return dists, idxs
+
+
+if njit is not None:
+    # Compiled once and cached on disk; prange spreads queries over all cores
+    _nearest_brute = njit(parallel=True, cache=True)(_nearest_brute)
+else:
+    _nearest_brute = None
+
+
+def nearest_within(points: np.ndarray, queries: np.ndarray, max_distance: float):
+    """
+    Find the nearest of points for each query point, up to max_distance.
+
+    Uses a scipy k-d tree when available, or else a numba-compiled
+    brute-force kernel. Without either, points are bucketed into a grid
+    of max_distance-sized cells, and each query only looks at its own
+    cell and the 8 around it, which is where any point within
+    max_distance must be.
+
+    Returns:
+        (distances, indices) like cKDTree.query(k=1): queries with nothing
+        in range get distance inf and index len(points)
+    """
+    if cKDTree is not None:
+        # Spread over all cores
+        return cKDTree(points).query(
+            queries, k=1, distance_upper_bound=max_distance, workers=-1
+        )
+
+    if _nearest_brute is not None:
+        return _nearest_brute(
+            np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1]),
+            np.ascontiguousarray(queries[:, 0]), np.ascontiguousarray(queries[:, 1]),
+            float(max_distance),
+        )
+
+    grid = defaultdict(list)
+    for i, (x, y) in enumerate(points.tolist()):
+        grid[int(x // max_distance), int(y // max_distance)].append((x, y, i))
+
+    dists = []
+    idxs = []
+    for qx, qy in queries.tolist():
+        best_dist = inf
+        best_idx = len(points)
+        cx = int(qx // max_distance)
+        cy = int(qy // max_distance)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for x, y, i in grid.get((cx + dx, cy + dy), ()):
+                    dist = hypot(x - qx, y - qy)
+                    if dist < best_dist:
+                        best_dist = dist
+                        best_idx = i
+        if best_dist > max_distance:
+            best_dist = inf
+            best_idx = len(points)
+        dists.append(best_dist)
+        idxs.append(best_idx)
+    return np.array(dists), np.array(idxs, dtype=np.intp)
+
+
+@lru_cache(maxsize=None)
+def utm_transformer() -> Transformer:
+    """
+    WGS84 lon/lat -> EPSG:25832 (UTM zone 32N) transformer.
+
+    This is the pipeline Transformer.from_crs("EPSG:4326", "EPSG:25832",
+    always_xy=True) resolves to (ETRS89 -> WGS 84 is a null
+    transformation). Giving it directly skips the CRS database search;
+    the cache builds one transformer per process.
+    """
+    return Transformer.from_pipeline(
+        "+proj=pipeline +step +proj=unitconvert +xy_in=deg +xy_out=rad "
+        "+step +proj=utm +zone=32 +ellps=GRS80"
+    )
+
+
+def write_attrs_parquet(features, path: Path) -> bool:
+    """
+    Write the temporal attributes of the OSM buildings as a Parquet table.
+
+    One row per building keyed by osm_id, with typed start_date/end_date
+    columns, so tools that only need the dates can read them without
+    parsing the GeoJSON. The GeoJSON still carries the same properties.
+
+    Returns:
+        True if written, False if pandas/pyarrow are not available
+    """
+    try:
+        import pandas as pd
+        import pyarrow  # noqa: F401  (Parquet engine)
+    except ImportError:
+        print("pandas/pyarrow not installed, skipping Parquet output")
+        return False
+
+    columns = {'osm_id': [f['properties'].get('osm_id') for f in features]}
+    for column in ATTRS_COLUMNS:
+        columns[column] = [f['properties'].get(column) for f in features]
+    # Unmatched buildings keep their raw OSM start_date tag ("1895", "~1900")
+    for column in ('start_date', 'end_date'):
+        columns[column] = [parse_year(v) for v in columns[column]]
+    pd.DataFrame(columns).astype(
+        {'start_date': 'Int64', 'end_date': 'Int64'}
+    ).to_parquet(path, index=False)
+    return True
+
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('--parquet', action='store_true',
+                    help='Also write the temporal attributes to '
+                         'buildings_temporal_attrs.parquet (requires pandas and pyarrow)')
+parser.add_argument('-v', '--verbose', action='store_true',
+                    help='Print sample SEFRAK points and OSM centroids')
+args = parser.parse_args()
+
+# Load SEFRAK straight into columns, one feature at a time (streamed with
+# ijson for large files), without keeping the parsed features around.
+# Attributes are parallel lists indexed by the position the
+# nearest-neighbour query returns.
 print("Loading SEFRAK...")
-with open(data_dir / 'sefrak' / 'sefrak_trondheim.geojson', 'r') as f:
-    sefrak_data = json.load(f)
-sefrak_features = sefrak_data['features']
-print(f"Loaded {len(sefrak_features)} SEFRAK buildings")
+sefrak_xs = array('d')
+sefrak_ys = array('d')
+start_dates = []
+end_dates = []
+periods = []
+names = []
+for f in iter_geojson_features(data_dir / 'sefrak' / 'sefrak_trondheim.geojson'):
+    coords = f['geometry']['coordinates']
+    sefrak_xs.append(coords[0])
+    sefrak_ys.append(coords[1])
+    props = f['properties']
+    start_dates.append(props.get('start_date'))
+    end_dates.append(props.get('end_date'))
+    periods.append(props.get('period_description'))
+    names.append(props.get('name', ''))
+xs = np.frombuffer(sefrak_xs, dtype=np.float64)
+ys = np.frombuffer(sefrak_ys, dtype=np.float64)
+print(f"Loaded {len(xs)} SEFRAK buildings")
 
-# Load existing OSM buildings
+# Load existing OSM buildings (kept whole: they are updated and rewritten)
 print("Loading OSM buildings...")
-with open(data_dir / 'buildings_temporal.geojson', 'r') as f:
-    osm_data = json.load(f)
+osm_data = load_json(data_dir / 'buildings_temporal.geojson')
 osm_features = osm_data['features']
 print(f"Loaded {len(osm_features)} OSM buildings")
 
-# Transform SEFRAK from EPSG:25832 to EPSG:4326
-transformer = Transformer.from_crs("EPSG:25832", "EPSG:4326", always_xy=True)
+# Matching happens in SEFRAK's own CRS (EPSG:25832, metres): the OSM
+# centroids are projected into it, rather than SEFRAK being converted to
+# WGS84 and distances approximated from degrees. The pipeline uses no
+# grid files, so PROJ's network/cache settings (PROJ_NETWORK) are left as
+# the user configured them.
+to_utm = utm_transformer()
 
-sefrak_points = []
-for f in sefrak_features:
-    coords = f['geometry']['coordinates']
-    lon, lat = transformer.transform(coords[0], coords[1])
-    sefrak_points.append({
-        'lon': lon,
-        'lat': lat,
-        'start_date': f['properties'].get('start_date'),
-        'end_date': f['properties'].get('end_date'),
-        'period': f['properties'].get('period_description'),
-        'name': f['properties'].get('name', ''),
-    })
-
-# Show sample SEFRAK coordinates to verify transform
-print("\nSample SEFRAK points (WGS84):")
-for i, p in enumerate(sefrak_points[:3]):
-    print(f"  {p['name'][:40]:40} lon={p['lon']:.4f} lat={p['lat']:.4f}")
+# Show sample SEFRAK coordinates
+if args.verbose:
+    print("\nSample SEFRAK points (EPSG:25832):")
+    for name, x, y in zip(names[:3], xs[:3].tolist(), ys[:3].tolist()):
+        print(f"  {name[:40]:40} x={x:.1f} y={y:.1f}")
+
+# OSM building centroids (mean of the outer ring's vertices), computed
+# for all buildings at once: the rings are concatenated into one array and
+# summed per building with np.add.reduceat
+rings = [f['geometry']['coordinates'][0] for f in osm_features]
+counts = np.fromiter((len(ring) for ring in rings), dtype=np.int64, count=len(rings))
+if len(rings):
+    vertices = np.array(list(chain.from_iterable(rings)), dtype=np.float64)[:, :2]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    centroids = np.add.reduceat(vertices, starts, axis=0) / counts[:, None]
+else:
+    centroids = np.empty((0, 2))
 
 # Show sample OSM building centroids
-print("\nSample OSM building centroids:")
-for i, f in enumerate(osm_features[:3]):
-    coords = f['geometry']['coordinates'][0]
-    cx = sum(c[0] for c in coords) / len(coords)
-    cy = sum(c[1] for c in coords) / len(coords)
-    print(f"  OSM {f['properties'].get('osm_id', 'unknown'):12} lon={cx:.4f} lat={cy:.4f}")
+if args.verbose:
+    print("\nSample OSM building centroids:")
+    for f, (cx, cy) in zip(osm_features[:3], centroids[:3].tolist()):
+        print(f"  OSM {f['properties'].get('osm_id', 'unknown'):12} lon={cx:.4f} lat={cy:.4f}")
 
 # Match SEFRAK to OSM buildings
 print("\nMatching SEFRAK to OSM buildings...")
 max_distance = 30  # meters
 
+# All centroids to metres in one call
+cxs, cys = to_utm.transform(centroids[:, 0], centroids[:, 1])
+
+# Nearest SEFRAK point for every OSM centroid; points further than
+# max_distance come back with an infinite distance
+dists, idxs = nearest_within(
+    np.column_stack((xs, ys)), np.column_stack((cxs, cys)), max_distance
+)
+
+# Apply matches and, in the same pass, the assumed-1950 defaults for
+# buildings that neither matched now nor came from SEFRAK before
 matched = 0
-for osm_f in osm_features:
-    coords = osm_f['geometry']['coordinates'][0]
-    cx = sum(c[0] for c in coords) / len(coords)
-    cy = sum(c[1] for c in coords) / len(coords)
-
-    # Find nearest SEFRAK point
-    best_dist = float('inf')
-    best_sefrak = None
-
-    for sefrak in sefrak_points:
-        # Distance in meters (approximate at this latitude)
-        dx = (sefrak['lon'] - cx) * 111320 * 0.5  # cos(63°) ≈ 0.45
-        dy = (sefrak['lat'] - cy) * 111320
-        dist = sqrt(dx*dx + dy*dy)
-
-        if dist < best_dist:
-            best_dist = dist
-            best_sefrak = sefrak
-
-    if best_sefrak and best_dist < max_distance:
-        if best_sefrak['start_date']:
-            osm_f['properties']['start_date'] = best_sefrak['start_date']
-            osm_f['properties']['end_date'] = best_sefrak.get('end_date', 2025)
-            osm_f['properties']['source'] = 'sefrak'
-            osm_f['properties']['sefrak_period'] = best_sefrak['period']
-            matched += 1
+for osm_f, best_dist, best_idx in zip(osm_features, dists.tolist(), idxs.tolist()):
+    props = osm_f['properties']
+    if best_dist < max_distance and start_dates[best_idx]:
+        props['start_date'] = start_dates[best_idx]
+        props['end_date'] = end_dates[best_idx]
+        props['source'] = 'sefrak'
+        props['sefrak_period'] = periods[best_idx]
+        matched += 1
+    elif props.get('source') != 'sefrak':
+        start_date = props.get('start_date')
+        if not start_date or start_date == 1950:
+            props['start_date'] = 1950
+            props['end_date'] = 2025
+            props['source'] = 'osm_assumed'
 
 print(f"Matched {matched} buildings")
 
-# Update non-matched buildings
-for osm_f in osm_features:
-    if osm_f['properties'].get('source') != 'sefrak':
-        if not osm_f['properties'].get('start_date') or osm_f['properties'].get('start_date') == 1950:
-            osm_f['properties']['start_date'] = 1950
-            osm_f['properties']['end_date'] = 2025
-            osm_f['properties']['source'] = 'osm_assumed'
-
 # Save
 output_path = data_dir / 'buildings_temporal.geojson'
-with open(output_path, 'w') as f:
-    json.dump(osm_data, f)
+write_json(output_path, osm_data)
 
 print(f"\nSaved to: {output_path}")
 
+if args.parquet:
+    attrs_path = data_dir / 'buildings_temporal_attrs.parquet'
+    if write_attrs_parquet(osm_features, attrs_path):
+        print(f"Attributes: {attrs_path}")
+
 # Statistics
-sources = {}
-for f in osm_features:
-    src = f['properties'].get('source', 'unknown')
-    sources[src] = sources.get(src, 0) + 1
+sources = Counter(f['properties'].get('source', 'unknown') for f in osm_features)
 
 print("\nBuildings by source:")
-for src, count in sorted(sources.items(), key=lambda x: -x[1]):
+for src, count in sources.most_common():
     print(f"  {src}: {count}")
@@ -13,6 +13,7 @@ import sys
 import tempfile
 import shutil
 from pathlib import Path
+from typing import Optional
 import json
 
 # Check for required dependencies
@@ -26,48 +27,75 @@ except ImportError as e:
     print("Some tests will be skipped. Install with: pip install numpy pillow")
     HAS_DEPS = False
 
+# Throwaway fixtures: fastest zlib level instead of Pillow's default (6)
+TEST_PNG_COMPRESS_LEVEL = 1
 
-def create_test_tiles(output_dir: Path, count: int = 5):
-    """Create dummy test tiles."""
+# Valid 1x1 grayscale PNG, written for tiles that are only counted
+STUB_TILE_PNG = (
+    b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01'
+    b'\x08\x00\x00\x00\x00:~\x9bU\x00\x00\x00\nIDATx\x9cc8\x01\x00\x00'
+    b'\xca\x00\xc9\x99\xca]~\x00\x00\x00\x00IEND\xaeB`\x82'
+)
+
+
+def _tile_path(tiles_dir: Path, index: int) -> Path:
+    """Path of the index-th (0-based) tile written by create_test_tiles."""
+    return tiles_dir / f"test_tile_{index+1:03d}.png"
+
+
+def create_test_tiles(output_dir: Path, count: int = 5, rendered: Optional[int] = None):
+    """
+    Create dummy test tiles.
+
+    Only the first `rendered` tiles (default: all) get a drawn 256x256
+    scene; the rest are 1x1 PNG stubs, which is all the progress tracker
+    needs to count them.
+    """
     if not HAS_DEPS:
         print(f"Skipping test tile creation (missing dependencies)")
         return
 
     print(f"Creating {count} test tiles in {output_dir}")
 
-    for i in range(count):
+    if rendered is None:
+        rendered = count
+    for i in range(rendered, count):
+        _tile_path(output_dir, i).write_bytes(STUB_TILE_PNG)
+
+    rng = np.random.default_rng()
+
+    for i in range(min(rendered, count)):
         # Create a simple test image (256x256)
         img = Image.new('RGB', (256, 256), color=(200, 200, 180))
         draw = ImageDraw.Draw(img)
 
+        # Random layout for the whole tile in a few array draws: buildings
+        # (x, y, w, h), roads (x1, y1, x2, y2), water position and whether
+        # to draw it
+        buildings = rng.integers((20, 20, 20, 20), (200, 200, 60, 60), size=(3, 4))
+        roads = rng.integers(0, 256, size=(2, 4))
+        water = rng.integers(20, 150, size=2)
+        has_water = rng.random() > 0.5
+
         # Draw some features
         # Buildings (red rectangles)
-        for _ in range(3):
-            x = np.random.randint(20, 200)
-            y = np.random.randint(20, 200)
-            w = np.random.randint(20, 60)
-            h = np.random.randint(20, 60)
+        for x, y, w, h in buildings.tolist():
             draw.rectangle([x, y, x+w, y+h], fill=(180, 100, 100), outline=(100, 50, 50))
 
         # Roads (yellow lines)
-        for _ in range(2):
-            x1 = np.random.randint(0, 256)
-            y1 = np.random.randint(0, 256)
-            x2 = np.random.randint(0, 256)
-            y2 = np.random.randint(0, 256)
+        for x1, y1, x2, y2 in roads.tolist():
             draw.line([x1, y1, x2, y2], fill=(200, 200, 100), width=5)
 
         # Water (blue shape)
-        if np.random.random() > 0.5:
-            x = np.random.randint(20, 150)
-            y = np.random.randint(20, 150)
+        if has_water:
+            x, y = water.tolist()
             draw.ellipse([x, y, x+80, y+60], fill=(100, 150, 200))
 
         # Add tile number
         draw.text((10, 10), f"Tile {i+1}", fill=(50, 50, 50))
 
         # Save
-        img.save(output_dir / f"test_tile_{i+1:03d}.png")
+        img.save(_tile_path(output_dir, i), compress_level=TEST_PNG_COMPRESS_LEVEL)
 
     print(f"✓ Created {count} test tiles")
 
@@ -120,7 +148,9 @@ def create_dummy_annotations(annotations_dir: Path, tiles_dir: Path, count: int
     images_dir.mkdir(parents=True, exist_ok=True)
     masks_dir.mkdir(parents=True, exist_ok=True)
 
-    tiles = sorted(tiles_dir.glob("*.png"))[:count]
+    # Tile names are known from create_test_tiles; no directory scan needed
+    tiles = [_tile_path(tiles_dir, i) for i in range(count)]
+    tiles = [tile for tile in tiles if tile.exists()]
 
     progress = {
         'annotated': [],
@@ -149,7 +179,7 @@ def create_dummy_annotations(annotations_dir: Path, tiles_dir: Path, count: int
         # Save mask
         mask_path = masks_dir / f"{tile.stem}_mask.png"
         mask_img = Image.fromarray(mask, mode='L')
-        mask_img.save(mask_path)
+        mask_img.save(mask_path, compress_level=TEST_PNG_COMPRESS_LEVEL)
 
         # Update progress
         from datetime import datetime, timedelta
@@ -229,7 +259,8 @@ def main():
         annotations_dir.mkdir()
 
         # Create test data
-        create_test_tiles(tiles_dir, count=5)
+        # Only the annotated tiles are copied and paired with 256x256 masks
+        create_test_tiles(tiles_dir, count=5, rendered=2)
         create_dummy_annotations(annotations_dir, tiles_dir, count=2)
 
         # Test progress tracker
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for rematch_sefrak.py.
+
+Runs the script on a tiny SEFRAK/OSM fixture in a temporary data
+directory and checks the rewritten GeoJSON and the Parquet sidecar,
+including OSM buildings that keep a raw string start_date tag.
+
+Usage:
+    python test_rematch_sefrak.py
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from pyproj import Transformer
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def square(lon, lat, size=0.0001):
+    """Closed square polygon ring around (lon, lat)."""
+    return {'type': 'Polygon', 'coordinates': [[
+        [lon - size, lat - size], [lon + size, lat - size],
+        [lon + size, lat + size], [lon - size, lat + size],
+        [lon - size, lat - size],
+    ]]}
+
+
+def building(osm_id, lon, lat, **props):
+    return {'type': 'Feature', 'properties': {'osm_id': osm_id, **props},
+            'geometry': square(lon, lat)}
+
+
+def create_fixture(root: Path):
+    """Copy the script into root/scripts and write its inputs to root/data."""
+    scripts_dir = root / 'scripts'
+    scripts_dir.mkdir()
+    shutil.copy(SCRIPTS_DIR / 'rematch_sefrak.py', scripts_dir)
+    shutil.copytree(SCRIPTS_DIR / 'normalize', scripts_dir / 'normalize',
+                    ignore=shutil.ignore_patterns('__pycache__'))
+
+    data_dir = root / 'data'
+    (data_dir / 'sefrak').mkdir(parents=True)
+
+    # One SEFRAK building (EPSG:25832) under the first OSM building
+    x, y = Transformer.from_crs('EPSG:4326', 'EPSG:25832', always_xy=True).transform(10.40, 63.43)
+    sefrak = {'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature',
+         'properties': {'name': 'Bryggen', 'start_date': 1750, 'end_date': None,
+                        'period_description': '1700-1750'},
+         'geometry': {'type': 'Point', 'coordinates': [x, y]}},
+    ]}
+    with open(data_dir / 'sefrak' / 'sefrak_trondheim.geojson', 'w') as f:
+        json.dump(sefrak, f)
+
+    osm = {'type': 'FeatureCollection', 'features': [
+        building(1, 10.40, 63.43, start_date=''),
+        building(2, 10.50, 63.45, start_date='~1900'),
+        building(3, 10.51, 63.45, start_date='1880s', end_date='1960'),
+        building(4, 10.52, 63.45),
+    ]}
+    with open(data_dir / 'buildings_temporal.geojson', 'w') as f:
+        json.dump(osm, f)
+
+    return scripts_dir, data_dir
+
+
+def parquet_available():
+    try:
+        import pandas  # noqa: F401
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def test_rematch_parquet():
+    """Test --parquet with string OSM dates left on unmatched buildings."""
+    print("Testing rematch_sefrak.py --parquet...")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        scripts_dir, data_dir = create_fixture(Path(tmpdir))
+
+        result = subprocess.run(
+            [sys.executable, 'rematch_sefrak.py', '--parquet'],
+            cwd=scripts_dir, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert 'Matched 1 buildings' in result.stdout
+        assert 'Buildings by source:' in result.stdout
+        print("  ✓ Script completed and printed statistics")
+
+        with open(data_dir / 'buildings_temporal.geojson') as f:
+            props = {p['osm_id']: p for p in (f['properties'] for f in json.load(f)['features'])}
+        assert props[1]['source'] == 'sefrak' and props[1]['start_date'] == 1750
+        assert props[2]['start_date'] == '~1900'
+        assert props[3]['start_date'] == '1880s'
+        assert props[4]['source'] == 'osm_assumed' and props[4]['start_date'] == 1950
+        print("  ✓ GeoJSON keeps the raw OSM date tags")
+
+        attrs_path = data_dir / 'buildings_temporal_attrs.parquet'
+        if not parquet_available():
+            print("  ⚠ pandas/pyarrow not installed, skipping Parquet checks")
+            assert not attrs_path.exists()
+            return
+
+        import pandas as pd
+
+        attrs = pd.read_parquet(attrs_path).set_index('osm_id')
+        assert str(attrs['start_date'].dtype) == 'Int64'
+        assert attrs['start_date'].tolist() == [1750, 1900, 1880, 1950]
+        assert attrs.loc[3, 'end_date'] == 1960
+        assert pd.isna(attrs.loc[1, 'end_date'])
+        print("  ✓ Parquet dates parsed to Int64 years")
+
+    print("  All rematch_sefrak tests passed!\n")
+
+
+def main():
+    print("=" * 60)
+    print("REMATCH SEFRAK TESTS")
+    print("=" * 60 + "\n")
+
+    test_rematch_parquet()
+
+    print("All tests passed!")
+
+
+if __name__ == '__main__':
+    main()
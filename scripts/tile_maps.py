@@ -28,10 +28,12 @@ Usage:
 """
 
 import argparse
-import json
 import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, starmap
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -50,6 +52,13 @@ except ImportError:
     print("ERROR: Pillow is required. Install with: pip install Pillow")
     sys.exit(1)
 
+try:
+    import imagecodecs
+except ImportError:
+    imagecodecs = None
+
+from normalize.base import write_json
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -60,6 +69,21 @@ logger = logging.getLogger(__name__)
 # Enable GDAL exceptions
 gdal.UseExceptions()
 
+# Per-process state of tile workers (see _init_tile_worker)
+_worker_process_row = None
+
+
+def _init_tile_worker(tiler: 'MapTiler', input_path: str, context: Dict) -> None:
+    """Open the input dataset once in a worker process."""
+    global _worker_process_row
+    ds = gdal.Open(input_path, gdal.GA_ReadOnly)
+    _worker_process_row = partial(tiler._process_row, ds, **context)
+
+
+def _process_row_task(task: Tuple) -> List[Optional[Dict]]:
+    """Process one (row, y_off, y_size, windows) task (process pool worker)."""
+    return _worker_process_row(*task)
+
 
 class MapTiler:
     """Cut georeferenced maps into tiles."""
@@ -70,7 +94,9 @@ class MapTiler:
         overlap: int = 0,
         skip_empty: bool = True,
         empty_threshold: float = 0.95,
-        output_format: str = 'PNG'
+        output_format: str = 'PNG',
+        workers: Optional[int] = 1,
+        png_compress_level: int = 1
     ):
         """
         Initialize map tiler.
@@ -81,12 +107,21 @@ class MapTiler:
             skip_empty: If True, skip tiles that are mostly empty
             empty_threshold: Fraction of empty pixels to consider tile empty
             output_format: Output image format (PNG, JPEG, TIFF)
+            workers: Worker processes per map (None = CPU count, 1 = serial)
+            png_compress_level: zlib level for PNG tiles (0-9); PNG encoding
+                dominates tiling time, and level 1 is several times faster
+                than Pillow's default of 6 for slightly larger files
         """
         self.tile_size = tile_size
         self.overlap = overlap
         self.skip_empty = skip_empty
         self.empty_threshold = empty_threshold
         self.output_format = output_format.upper()
+        self.workers = workers
+        self.png_compress_level = png_compress_level
+
+        # Reused output buffer for padded edge tiles (see _pad_tile)
+        self._pad_buf = None
 
     def tile_map(
         self,
@@ -147,92 +182,81 @@ class MapTiler:
 
         logger.info(f"Creating {cols}x{rows} = {cols*rows} tiles (overlap: {self.overlap}px)")
 
-        # Tile the image
+        # Tile the image. Rows of tiles are read, checked, padded, encoded
+        # and written independently, so the work can be spread over processes.
         tiles_created = 0
         tiles_skipped = 0
         tile_metadata = []
 
+        tasks = []
+        for row in range(rows):
+            windows = []
+            for col in range(cols):
+                # Calculate tile boundaries
+                x_off = col * step
+                y_off = row * step
+                x_size = min(self.tile_size, width - x_off)
+                y_size = min(self.tile_size, height - y_off)
+
+                # Skip if tile is too small
+                if x_size < self.tile_size // 2 or y_size < self.tile_size // 2:
+                    tiles_skipped += 1
+                    continue
+
+                windows.append((col, x_off, x_size))
+
+            if windows:
+                tasks.append((row, y_off, y_size, windows))
+
+        # Tile windows that do not line up with the file's internal blocks
+        # (e.g. strip-organized TIFFs, or tiles straddling block edges) make
+        # GDAL decompress the same blocks for several tiles. Then read each
+        # row of tiles as one full-width strip and slice the tiles from it.
+        block_x, block_y = ds.GetRasterBand(1).GetBlockSize()
+        read_strips = (
+            block_x >= width
+            or step % block_x or step % block_y
+            or self.tile_size % block_x or self.tile_size % block_y
+        )
+        if read_strips:
+            logger.info(f"Reading {block_x}x{block_y} blocks as full-width strips")
+
+        context = {
+            'read_strips': bool(read_strips),
+            'bands': bands,
+            'output_dir': output_dir,
+            'prefix': prefix,
+            'geotransform': geotransform if has_geo else None,
+            'projection': projection,
+        }
+
         with tqdm(total=rows*cols, desc="Tiling") as pbar:
-            for row in range(rows):
-                for col in range(cols):
-                    # Calculate tile boundaries
-                    x_off = col * step
-                    y_off = row * step
-                    x_size = min(self.tile_size, width - x_off)
-                    y_size = min(self.tile_size, height - y_off)
-
-                    # Skip if tile is too small
-                    if x_size < self.tile_size // 2 or y_size < self.tile_size // 2:
+            pbar.update(tiles_skipped)
+
+            if self.workers != 1 and len(tasks) > 1:
+                # GDAL datasets cannot be shared between processes: each
+                # worker opens its own handle once, in the initializer
+                executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_tile_worker,
+                    initargs=(self, str(input_path), context)
+                )
+                rows_done = executor.map(_process_row_task, tasks)
+            else:
+                executor = None
+                rows_done = starmap(partial(self._process_row, ds, **context), tasks)
+
+            try:
+                for tile_meta in chain.from_iterable(rows_done):
+                    if tile_meta is None:
                         tiles_skipped += 1
-                        pbar.update(1)
-                        continue
-
-                    # Read tile data
-                    try:
-                        tile_data = ds.ReadAsArray(x_off, y_off, x_size, y_size)
-
-                        if tile_data is None:
-                            logger.warning(f"Could not read tile at ({col}, {row})")
-                            tiles_skipped += 1
-                            pbar.update(1)
-                            continue
-
-                        # Handle single band vs multi-band
-                        if bands == 1:
-                            tile_data = tile_data.reshape(y_size, x_size)
-                        else:
-                            # Transpose from (bands, height, width) to (height, width, bands)
-                            tile_data = np.transpose(tile_data, (1, 2, 0))
-
-                        # Check if tile is empty
-                        if self.skip_empty and self._is_empty(tile_data):
-                            tiles_skipped += 1
-                            pbar.update(1)
-                            continue
-
-                        # Pad tile if needed
-                        if x_size < self.tile_size or y_size < self.tile_size:
-                            tile_data = self._pad_tile(tile_data, self.tile_size, bands)
-
-                        # Generate tile name: prefix_z_row_col.ext
-                        # z is placeholder for zoom level (0 for now)
-                        tile_name = f"{prefix}_0_{row}_{col}"
-                        tile_path = output_dir / f"{tile_name}.{self.output_format.lower()}"
-
-                        # Save tile image
-                        self._save_tile(tile_data, tile_path)
-
-                        # Calculate tile bounds in geo-coordinates
-                        if has_geo:
-                            bounds = self._calculate_bounds(
-                                geotransform,
-                                x_off, y_off,
-                                x_size, y_size
-                            )
-                        else:
-                            bounds = None
-
-                        # Save metadata
-                        tile_meta = {
-                            'filename': tile_name + f".{self.output_format.lower()}",
-                            'row': row,
-                            'col': col,
-                            'pixel_x': x_off,
-                            'pixel_y': y_off,
-                            'pixel_width': x_size,
-                            'pixel_height': y_size,
-                            'bounds': bounds,
-                            'crs': projection if projection else None,
-                        }
+                    else:
                         tile_metadata.append(tile_meta)
-
                         tiles_created += 1
-
-                    except Exception as e:
-                        logger.warning(f"Error processing tile ({col}, {row}): {e}")
-                        tiles_skipped += 1
-
                     pbar.update(1)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
 
         # Save tile index
         index_path = output_dir / f"{prefix}_tiles.json"
@@ -249,8 +273,7 @@ class MapTiler:
             'tiles': tile_metadata,
         }
 
-        with open(index_path, 'w') as f:
-            json.dump(index_data, f, indent=2)
+        write_json(index_path, index_data)
 
         logger.info(f"Created {tiles_created} tiles, skipped {tiles_skipped}")
         logger.info(f"Tile index saved to: {index_path}")
@@ -260,6 +283,136 @@ class MapTiler:
 
         return index_data
 
+    def _process_row(
+        self,
+        ds,
+        row: int,
+        y_off: int,
+        y_size: int,
+        windows: List[Tuple[int, int, int]],
+        read_strips: bool,
+        **context
+    ) -> List[Optional[Dict]]:
+        """
+        Read, check and save one row of tiles.
+
+        Args:
+            ds: Open GDAL dataset to read from
+            row: Row in the tile grid
+            y_off, y_size: Pixel rows covered by the tiles
+            windows: (col, x_off, x_size) of each tile in the row
+            read_strips: Read the row as one full-width strip instead of
+                one window per tile
+            **context: Passed on to _process_tile()
+
+        Returns:
+            Metadata for each tile (None for skipped tiles)
+        """
+        strip = None
+        if read_strips:
+            try:
+                strip = ds.ReadAsArray(0, y_off, ds.RasterXSize, y_size)
+            except Exception as e:
+                logger.warning(f"Could not read strip for row {row}: {e}")
+
+        return [
+            self._process_tile(ds, row, col, x_off, y_off, x_size, y_size,
+                               strip=strip, **context)
+            for col, x_off, x_size in windows
+        ]
+
+    def _process_tile(
+        self,
+        ds,
+        row: int,
+        col: int,
+        x_off: int,
+        y_off: int,
+        x_size: int,
+        y_size: int,
+        bands: int,
+        output_dir: Path,
+        prefix: str,
+        geotransform: Optional[Tuple],
+        projection: Optional[str],
+        strip: Optional[np.ndarray] = None
+    ) -> Optional[Dict]:
+        """
+        Read, check and save a single tile.
+
+        Args:
+            ds: Open GDAL dataset to read from
+            row, col: Position in the tile grid
+            x_off, y_off, x_size, y_size: Pixel window of the tile
+            bands: Number of raster bands
+            output_dir: Directory to save the tile
+            prefix: Tile filename prefix
+            geotransform: GDAL geotransform, or None if not georeferenced
+            projection: Dataset projection (WKT)
+            strip: Already-read full-width strip containing the tile, if any
+
+        Returns:
+            Tile metadata, or None if the tile was skipped
+        """
+        try:
+            if strip is not None:
+                tile_data = strip[..., x_off:x_off + x_size]
+            else:
+                tile_data = ds.ReadAsArray(x_off, y_off, x_size, y_size)
+
+            if tile_data is None:
+                logger.warning(f"Could not read tile at ({col}, {row})")
+                return None
+
+            # Handle single band vs multi-band
+            if bands == 1:
+                tile_data = tile_data.reshape(y_size, x_size)
+            else:
+                # Transpose from (bands, height, width) to (height, width, bands)
+                tile_data = np.transpose(tile_data, (1, 2, 0))
+
+            # Check if tile is empty
+            if self.skip_empty and self._is_empty(tile_data):
+                return None
+
+            # Pad tile if needed
+            if x_size < self.tile_size or y_size < self.tile_size:
+                tile_data = self._pad_tile(tile_data, self.tile_size, bands)
+
+            # Generate tile name: prefix_z_row_col.ext
+            # z is placeholder for zoom level (0 for now)
+            tile_name = f"{prefix}_0_{row}_{col}"
+            tile_path = output_dir / f"{tile_name}.{self.output_format.lower()}"
+
+            # Save tile image
+            self._save_tile(tile_data, tile_path)
+
+            # Calculate tile bounds in geo-coordinates
+            if geotransform is not None:
+                bounds = self._calculate_bounds(
+                    geotransform,
+                    x_off, y_off,
+                    x_size, y_size
+                )
+            else:
+                bounds = None
+
+            return {
+                'filename': tile_name + f".{self.output_format.lower()}",
+                'row': row,
+                'col': col,
+                'pixel_x': x_off,
+                'pixel_y': y_off,
+                'pixel_width': x_size,
+                'pixel_height': y_size,
+                'bounds': bounds,
+                'crs': projection if projection else None,
+            }
+
+        except Exception as e:
+            logger.warning(f"Error processing tile ({col}, {row}): {e}")
+            return None
+
     def _is_empty(self, tile_data: np.ndarray) -> bool:
         """
         Check if tile is mostly empty.
@@ -279,22 +432,36 @@ class MapTiler:
         # Check for common empty values
         if len(tile_data.shape) == 2:
             # Single band
-            empty_pixels = (tile_data == 0) | (tile_data == 255)
+            empty_pixels = tile_data == 0
+            empty_pixels |= tile_data == 255
         else:
-            # Multi-band: check if all bands are empty
-            empty_pixels = np.all(tile_data == 0, axis=2) | np.all(tile_data == 255, axis=2)
+            # Multi-band: check if all bands are empty, one band at a time
+            # into the same two masks (no full-size temporaries per band)
+            black = tile_data[:, :, 0] == 0
+            white = tile_data[:, :, 0] == 255
+            for band in range(1, tile_data.shape[2]):
+                black &= tile_data[:, :, band] == 0
+                white &= tile_data[:, :, band] == 255
+            empty_pixels = black
+            empty_pixels |= white
 
             # Check alpha channel if present (4th band)
             if tile_data.shape[2] == 4:
                 empty_pixels |= (tile_data[:, :, 3] == 0)
 
-        empty_fraction = np.mean(empty_pixels)
-        return empty_fraction > self.empty_threshold
+        # Integer count instead of a float mean over the mask
+        return np.count_nonzero(empty_pixels) > self.empty_threshold * empty_pixels.size
 
     def _pad_tile(self, tile_data: np.ndarray, target_size: int, bands: int) -> np.ndarray:
         """
         Pad tile to target size.
 
+        Every padded tile has the same shape, so one buffer is allocated
+        and reused: only the tile area is copied in and the margin zeroed.
+        The result is only valid until the next call (tiles are saved
+        before the next one is padded; each worker process has its own
+        MapTiler copy).
+
         Args:
             tile_data: Tile data array
             target_size: Target size (square)
@@ -305,14 +472,19 @@ class MapTiler:
         """
         if len(tile_data.shape) == 2:
             # Single band
-            padded = np.zeros((target_size, target_size), dtype=tile_data.dtype)
-            h, w = tile_data.shape
-            padded[:h, :w] = tile_data
+            shape = (target_size, target_size)
         else:
             # Multi-band
-            padded = np.zeros((target_size, target_size, bands), dtype=tile_data.dtype)
-            h, w = tile_data.shape[:2]
-            padded[:h, :w, :] = tile_data
+            shape = (target_size, target_size, bands)
+
+        padded = self._pad_buf
+        if padded is None or padded.shape != shape or padded.dtype != tile_data.dtype:
+            padded = self._pad_buf = np.empty(shape, dtype=tile_data.dtype)
+
+        h, w = tile_data.shape[:2]
+        padded[:h, :w] = tile_data
+        padded[h:] = 0
+        padded[:h, w:] = 0
 
         return padded
 
@@ -327,6 +499,17 @@ class MapTiler:
                 else:
                     tile_data = tile_data.astype(np.uint8)
 
+            # PNG straight from the array with imagecodecs (libpng) when
+            # installed: no PIL image, less per-tile overhead
+            if self.output_format == 'PNG' and imagecodecs is not None:
+                if tile_data.ndim == 3 and tile_data.shape[2] > 4:
+                    # More than 4 bands: save first 3 as RGB
+                    tile_data = tile_data[:, :, :3]
+                output_path.write_bytes(imagecodecs.png_encode(
+                    np.ascontiguousarray(tile_data), level=self.png_compress_level
+                ))
+                return
+
             # Create PIL image
             if len(tile_data.shape) == 2:
                 # Single band (grayscale)
@@ -349,6 +532,8 @@ class MapTiler:
                 if img.mode == 'RGBA':
                     img = img.convert('RGB')
                 img.save(output_path, 'JPEG', quality=95)
+            elif self.output_format == 'PNG':
+                img.save(output_path, 'PNG', compress_level=self.png_compress_level)
             else:
                 img.save(output_path, self.output_format)
 
@@ -472,6 +657,9 @@ Examples:
 
   # Include empty tiles
   python tile_maps.py map.tif --no-skip-empty
+
+  # Spread tiles over all CPU cores
+  python tile_maps.py map.tif --workers 0
         """
     )
 
@@ -523,6 +711,14 @@ Examples:
         choices=['PNG', 'JPEG', 'TIFF'],
         help='Output image format (default: PNG)'
     )
+    parser.add_argument(
+        '--png-compress-level',
+        type=int,
+        default=1,
+        choices=range(10),
+        metavar='0-9',
+        help='zlib compression level for PNG tiles (default: 1, Pillow default: 6)'
+    )
     parser.add_argument(
         '--pattern',
         type=str,
@@ -534,6 +730,12 @@ Examples:
         type=str,
         help='Prefix for tile filenames (default: input filename)'
     )
+    parser.add_argument(
+        '--workers', '-j',
+        type=int,
+        default=1,
+        help='Worker processes for reading and writing tiles (default: 1, 0 = CPU count)'
+    )
 
     args = parser.parse_args()
 
@@ -550,7 +752,9 @@ Examples:
         overlap=args.overlap,
         skip_empty=not args.no_skip_empty,
         empty_threshold=args.empty_threshold,
-        output_format=args.format
+        output_format=args.format,
+        workers=args.workers or None,
+        png_compress_level=args.png_compress_level
     )
 
     # Process files
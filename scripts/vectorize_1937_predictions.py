@@ -5,20 +5,26 @@ Vectorize 1937 aerial photo predictions to GeoJSON.
 Uses tile metadata for geo-referencing.
 
 Usage:
-    python scripts/vectorize_1937_predictions.py
+    python scripts/vectorize_1937_predictions.py [--workers N]
 """
 
-import json
+import argparse
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Optional, Tuple
 
 import cv2
 import numpy as np
+import shapely
 from PIL import Image
 from shapely.geometry import Polygon, mapping
 from shapely.ops import unary_union
 
+from normalize.base import load_json, write_json
+
 # Paths
 PREDICTIONS_DIR = Path("data/sources/ml_detected/ortofoto1937/predictions")
 METADATA_DIR = Path("data/training_1937/metadata")
@@ -69,28 +75,27 @@ def contour_to_polygon(contour: np.ndarray, min_area: float = 10.0):
     return polygon
 
 
-def pixel_to_geo(x: float, y: float, mask_shape: tuple, bounds: dict) -> tuple:
-    """Convert pixel coordinates to geographic coordinates."""
-    height, width = mask_shape
-
-    # Normalize to 0-1
-    norm_x = x / width
-    norm_y = y / height
+def transform_polygon(polygon: Polygon, mask_shape: tuple, bounds: dict) -> Polygon:
+    """
+    Transform polygon from pixel to geographic coordinates.
 
-    # Convert to geo (note: y is inverted)
-    lon = bounds['west'] + norm_x * (bounds['east'] - bounds['west'])
-    lat = bounds['north'] - norm_y * (bounds['north'] - bounds['south'])
+    All vertices (holes included) are mapped in one call with
+    shapely.transform: x/width and y/height are normalized to 0-1 and
+    scaled into the tile bounds (y is inverted).
+    """
+    height, width = mask_shape
+    west = bounds['west']
+    north = bounds['north']
+    lon_span = bounds['east'] - west
+    lat_span = north - bounds['south']
 
-    return (lon, lat)
+    def pixel_to_geo(coords: np.ndarray) -> np.ndarray:
+        geo_coords = np.empty_like(coords)
+        geo_coords[:, 0] = west + coords[:, 0] / width * lon_span
+        geo_coords[:, 1] = north - coords[:, 1] / height * lat_span
+        return geo_coords
 
-
-def transform_polygon(polygon: Polygon, mask_shape: tuple, bounds: dict) -> Polygon:
-    """Transform polygon from pixel to geo coordinates."""
-    geo_coords = [
-        pixel_to_geo(x, y, mask_shape, bounds)
-        for x, y in polygon.exterior.coords
-    ]
-    return Polygon(geo_coords)
+    return shapely.transform(polygon, pixel_to_geo)
 
 
 def vectorize_tile(pred_path: Path, meta_path: Path, min_area_m2: float = 20.0) -> list:
@@ -100,8 +105,7 @@ def vectorize_tile(pred_path: Path, meta_path: Path, min_area_m2: float = 20.0)
     mask_shape = mask.shape
 
     # Load metadata
-    with open(meta_path) as f:
-        meta = json.load(f)
+    meta = load_json(meta_path)
     bounds = meta['bounds']
 
     # Calculate approximate pixel size in meters
@@ -117,25 +121,30 @@ def vectorize_tile(pred_path: Path, meta_path: Path, min_area_m2: float = 20.0)
     pixel_size_m = (tile_width_m / mask_shape[1] + tile_height_m / mask_shape[0]) / 2
     min_area_px = min_area_m2 / (pixel_size_m ** 2)
 
+    # Simplification tolerance (~1m) in pixels
+    simplify_px = 1.0 / pixel_size_m
+
     # Extract building contours
     contours = extract_contours(mask, class_id=1)
 
     features = []
     for contour in contours:
-        polygon = contour_to_polygon(contour, min_area=min_area_px)
+        # Size filter on the raw contour, before simplification cuts corners
+        if cv2.contourArea(contour) < min_area_px:
+            continue
+
+        # Simplify in pixel space before any Polygon is built, so each
+        # building goes contour -> one polygon -> geo coordinates without
+        # a separate shapely simplify pass
+        contour = cv2.approxPolyDP(contour, simplify_px, True)
+
+        polygon = contour_to_polygon(contour, min_area=0.0)
         if polygon is None:
             continue
 
         # Transform to geo coordinates
         geo_polygon = transform_polygon(polygon, mask_shape, bounds)
 
-        # Simplify (tolerance in degrees, ~1m at this latitude)
-        simplify_tol = 1.0 / meters_per_deg_lon
-        geo_polygon = geo_polygon.simplify(simplify_tol)
-
-        if geo_polygon.is_empty:
-            continue
-
         features.append({
             "type": "Feature",
             "geometry": mapping(geo_polygon),
@@ -152,7 +161,33 @@ def vectorize_tile(pred_path: Path, meta_path: Path, min_area_m2: float = 20.0)
     return features
 
 
+def _vectorize_one(pred_path: Path) -> Tuple[str, Optional[list]]:
+    """
+    Vectorize one prediction tile (process pool worker).
+
+    Returns:
+        (tile_name, features), with features None if the tile has no metadata
+    """
+    # Find corresponding metadata (strip _mask suffix)
+    tile_name = pred_path.stem.replace("_mask", "")
+    meta_path = METADATA_DIR / f"{tile_name}.json"
+
+    if not meta_path.exists():
+        return tile_name, None
+
+    return tile_name, vectorize_tile(pred_path, meta_path)
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Vectorize 1937 aerial photo predictions to GeoJSON')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Parallel worker processes (default: 1, 0 = CPU count)'
+    )
+    args = parser.parse_args()
+
     # Ensure output directory exists
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -165,19 +200,23 @@ def main():
 
     print(f"Vectorizing {len(pred_files)} prediction tiles...")
 
+    # Tiles are independent: spread them over processes, collecting the
+    # results in file order
     all_features = []
-    for pred_path in pred_files:
-        # Find corresponding metadata (strip _mask suffix)
-        tile_name = pred_path.stem.replace("_mask", "")
-        meta_path = METADATA_DIR / f"{tile_name}.json"
+    parallel = args.workers != 1 and len(pred_files) > 1
+    with ProcessPoolExecutor(max_workers=args.workers or None) if parallel else nullcontext() as executor:
+        if executor is not None:
+            results = executor.map(_vectorize_one, pred_files, chunksize=8)
+        else:
+            results = map(_vectorize_one, pred_files)
 
-        if not meta_path.exists():
-            print(f"  Warning: No metadata for {tile_name}, skipping")
-            continue
+        for tile_name, features in results:
+            if features is None:
+                print(f"  Warning: No metadata for {tile_name}, skipping")
+                continue
 
-        features = vectorize_tile(pred_path, meta_path)
-        all_features.extend(features)
-        print(f"  {tile_name}: {len(features)} buildings")
+            all_features.extend(features)
+            print(f"  {tile_name}: {len(features)} buildings")
 
     # Create GeoJSON
     geojson = {
@@ -192,8 +231,7 @@ def main():
     }
 
     # Save
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump(geojson, f)
+    write_json(OUTPUT_PATH, geojson)
 
     print(f"\nSaved {len(all_features)} buildings to {OUTPUT_PATH}")
 